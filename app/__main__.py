@@ -0,0 +1,3 @@
+from app.launcher import main
+
+main()
@@ -3,16 +3,16 @@ from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from sqlalchemy import select
 
 from app.backend.config import settings
+from app.auth.hashing import password_hasher
 from app.auth.model import User
+from app.auth.token_cache import ACCESS_TOKEN_LIFETIME, token_cache
 from app.backend.db_depends import get_db
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 SECRET_KEY = settings.SECRET_KEY
@@ -28,7 +28,11 @@ async def authenticate_user(db: Annotated[AsyncSession, Depends(get_db)], userna
     user: User | None = await db.scalar(
         select(User).where(User.username == username)
     )
-    if not user or not bcrypt_context.verify(password, str(user.password)) or user.is_active == False:
+    if (
+            not user
+            or not await password_hasher.verify(password, str(user.password))
+            or user.is_active == False
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -42,14 +46,37 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 from jose import jwt, JWTError
 
 
+def _decode_token(token: str) -> dict:
+    payload: dict | None = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.set(token, payload)
+    return payload
+
+
+def get_token_user_id(token: str) -> str | None:
+    """
+    Return a user's id from a verified token
+    or None if the token is invalid
+
+    :param token: str
+    :return: str | None
+    """
+
+    try:
+        return _decode_token(token).get("id")
+    except JWTError:
+        return None
+
+
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> dict:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload: dict = _decode_token(token)
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
         is_admin: bool = payload.get("is_superuser")
         expire = payload.get("exp")
-        if username is None or user_id is None:
+        if username is None or user_id is None or token_cache.is_revoked(user_id):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate user"
@@ -93,7 +120,7 @@ async def login(
         username=str(user.username),
         user_id=str(user.id),
         is_superuser=bool(user.is_superuser),
-        expires_delta=timedelta(minutes=20)
+        expires_delta=ACCESS_TOKEN_LIFETIME
     )
     return {
         "access_token": token,
@@ -1,45 +1,11 @@
 from uuid import UUID
 
 from fastapi import HTTPException
-from pydantic import EmailStr
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 from starlette import status
 
 from app.auth.model import User
-from app.auth.schema import CreateUser, UpdateUser
-
-
-async def _is_username_taken(username: str, db: AsyncSession) -> bool:
-    """
-    Bool value of existing a user with given username
-
-    :param username: str
-    :param db: AsyncSession
-    :return: bool
-    """
-
-    return bool(
-        await db.scalar(
-            select(User).filter_by(username=username)
-        )
-    )
-
-
-async def _is_email_taken(email: str | EmailStr, db: AsyncSession) -> bool:
-    """
-    Bool value of existing a user with given email
-
-    :param email: str
-    :param db: AsyncSession
-    :return: bool
-    """
-
-    return bool(
-        await db.scalar(
-            select(User).filter_by(email=email)
-        )
-    )
 
 
 def user_not_exist(user: User | None) -> None:
@@ -59,6 +25,14 @@ def user_have_no_admin_permissions(user_id: str | UUID, get_user: dict) -> None:
             )
 
 
+def user_is_not_admin(get_user: dict) -> None:
+    if not get_user["is_superuser"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have admin permission"
+        )
+
+
 def admin_cant_edit_other_admin(
         user: User | UUID, get_user: dict, action_name: str = "update"
 ) -> None:
@@ -69,41 +43,47 @@ def admin_cant_edit_other_admin(
                 detail=f"You can't {action_name} other admin's data"
             )
 
-async def username_is_taken(
-        db: AsyncSession,
-        user_data: CreateUser | UpdateUser,
-        user: User | None = None
-) -> None:
-    if not user or (user_data.username and user.username != user_data.username):
-        is_username_taken: bool = await _is_username_taken(
-            db=db, username=user_data.username
-        )
-        if is_username_taken:
+
+def unique_user_field_is_taken(error: IntegrityError) -> None:
+    """
+    Translate a unique constraint violation on users table
+    into the same errors the pre-insert checks used to give
+
+    :param error: IntegrityError
+    :return: None
+    """
+
+    message: str = str(error.orig)
+    for field in ("username", "email"):
+        if f"users_{field}_key" in message or f"({field})" in message:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="This username is already taken"
+                detail=f"This {field} is already taken"
             )
+    raise error
 
 
-async def email_is_taken(
-        db: AsyncSession,
-        user_data: CreateUser | UpdateUser,
-) -> None:
-    is_email_taken: bool = await _is_email_taken(
-        db=db, email=user_data.email
-    )
-    if is_email_taken:
+def user_is_already_inactive(user: User) -> None:
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="This email is already taken"
+            detail="User already has been deleted"
         )
 
 
-def user_is_already_inactive(user: User) -> None:
-    if not user.is_active:
+def admin_cant_deactivate_themselves(user: User | Row, get_user: dict) -> None:
+    if str(user.id) == get_user["id"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="User already has been deleted"
+            detail="You can't deactivate your own account in bulk"
+        )
+
+
+def user_is_already_active(user: User) -> None:
+    if user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is already active"
         )
 
 
@@ -113,12 +93,8 @@ class UserExceptionManager:
     """
 
     @staticmethod
-    async def create_user_exceptions(
-            db: AsyncSession,
-            user_data: CreateUser
-    ) -> None:
-        await username_is_taken(db=db, user_data=user_data)
-        await email_is_taken(db=db, user_data=user_data)
+    def create_user_exceptions(error: IntegrityError) -> None:
+        unique_user_field_is_taken(error=error)
 
 
     @staticmethod
@@ -127,25 +103,19 @@ class UserExceptionManager:
 
 
     @staticmethod
-    async def update_user_exceptions(
-            user: User | None,
-            get_user: dict,
-            updated_data: UpdateUser,
-            db: AsyncSession
+    def update_user_exceptions(
+            user: User | Row | None, get_user: dict
     ) -> None:
         user_not_exist(user=user)
         user_have_no_admin_permissions(
             get_user=get_user, user_id=str(user.id)
         )
         admin_cant_edit_other_admin(user=user, get_user=get_user)
-        await username_is_taken(
-            user=user, user_data=updated_data, db=db
-        )
 
 
     @staticmethod
     def delete_user_exceptions(
-            user: User | None, get_user: dict
+            user: User | Row | None, get_user: dict
     ) -> None:
         user_not_exist(user=user)
         user_have_no_admin_permissions(
@@ -154,4 +124,20 @@ class UserExceptionManager:
         admin_cant_edit_other_admin(
             user=user, get_user=get_user, action_name="delete"
         )
-        user_is_already_inactive(user=user)
\ No newline at end of file
+        user_is_already_inactive(user=user)
+
+
+    @staticmethod
+    def update_users_status_exceptions(
+            user: User | Row | None, get_user: dict, is_active: bool
+    ) -> None:
+        user_not_exist(user=user)
+        admin_cant_edit_other_admin(
+            user=user, get_user=get_user,
+            action_name="reactivate" if is_active else "deactivate"
+        )
+        if is_active:
+            user_is_already_active(user=user)
+        else:
+            admin_cant_deactivate_themselves(user=user, get_user=get_user)
+            user_is_already_inactive(user=user)
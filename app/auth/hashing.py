@@ -0,0 +1,132 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from starlette import status
+
+from app.backend.config import settings
+
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasher:
+    """
+    Class which runs bcrypt hashing and verification
+    in a bounded thread pool instead of the event loop.
+    bcrypt releases the GIL, so the threads really run in parallel
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers: int = max_workers
+        self.max_pending: int = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self.in_flight: int = 0
+        self.submitted: int = 0
+        self.completed: int = 0
+        self.rejected: int = 0
+        self.total_seconds: float = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Amount of the jobs which wait for a free worker
+
+        :return: int
+        """
+
+        return max(self.in_flight - self.max_workers, 0)
+
+    async def _run(self, func: Callable, *args, wait_when_busy: bool = False):
+        if self.in_flight >= self.max_pending and not wait_when_busy:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+                headers={"Retry-After": "1"}
+            )
+        self.in_flight += 1
+        self.submitted += 1
+        started: float = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, func, *args
+            )
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_seconds += time.perf_counter() - started
+
+    async def hash(self, raw_password: str) -> str:
+        """
+        Return a bcrypt hash of a given password
+
+        :param raw_password: str
+        :return: str
+        """
+
+        return await self._run(bcrypt_context.hash, raw_password)
+
+    async def verify(self, raw_password: str, hashed_password: str) -> bool:
+        """
+        Bool value of matching a given password with a bcrypt hash
+
+        :param raw_password: str
+        :param hashed_password: str
+        :return: bool
+        """
+
+        return await self._run(bcrypt_context.verify, raw_password, hashed_password)
+
+    async def hash_many(self, raw_passwords: list[str]) -> list[str]:
+        """
+        Return bcrypt hashes of given passwords computed on all the workers.
+        The jobs wait for a free worker instead of being rejected,
+        at most max_workers of them are submitted at once
+        so single requests still get a place in the queue
+
+        :param raw_passwords: list[str]
+        :return: list[str] - hashes in the order of the passwords
+        """
+
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def hash_one(raw_password: str) -> str:
+            async with semaphore:
+                return await self._run(bcrypt_context.hash, raw_password, wait_when_busy=True)
+
+        return list(await asyncio.gather(*(hash_one(password) for password in raw_passwords)))
+
+    def metrics(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "total_seconds": self.total_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
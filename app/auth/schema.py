@@ -1,7 +1,12 @@
+from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, model_validator
+
+USERS_STATUS_MAX_IDS: int = 10_000
+USERS_STATUS_BATCH_SIZE: int = 1_000
+USERS_IMPORT_CHUNK_SIZE: int = 1_000
 
 class BaseUser(BaseModel):
     fullname: Annotated[str | None, Field(min_length=1, max_length=300)] = None
@@ -28,3 +33,44 @@ class ShowUser(BaseUser):
 class UpdateUser(BaseModel):
     fullname: Annotated[str | None, Field(min_length=1, max_length=300)] = None
     username: Annotated[str | None, Field(min_length=4, max_length=50)] = None
+
+
+class UsersFilter(BaseModel):
+    email_domain: Annotated[str | None, Field(min_length=1, max_length=100)] = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+    @model_validator(mode="after")
+    def has_criteria(self) -> "UsersFilter":
+        if all(value is None for value in self.model_dump().values()):
+            raise ValueError("The filter needs at least one criterion")
+        return self
+
+
+class UpdateUsersStatus(BaseModel):
+    is_active: bool
+    ids: Annotated[list[UUID] | None, Field(min_length=1, max_length=USERS_STATUS_MAX_IDS)] = None
+    filter: UsersFilter | None = None
+
+    @model_validator(mode="after")
+    def has_ids_or_filter(self) -> "UpdateUsersStatus":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Give either ids or filter")
+        return self
+
+
+class UserStatusResult(BaseModel):
+    user_id: UUID
+    status_code: int
+    detail: str
+
+
+class UserImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class UsersImportReport(BaseModel):
+    total: int
+    created: int
+    errors: list[UserImportError]
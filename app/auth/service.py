@@ -1,87 +1,145 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
 from pydantic import Field
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, Row, and_, false, ColumnElement
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Bundle
 from starlette import status
 
-from app.auth.auth_router import bcrypt_context
-from app.auth.exceptions import UserExceptionManager
+from app.auth.hashing import password_hasher
+from app.auth.exceptions import UserExceptionManager, unique_user_field_is_taken, user_is_not_admin
 from app.auth.model import User
-from app.auth.schema import CreateUserRaw, UpdateUser, ShowUser, CreateUser
+from app.auth.token_cache import token_cache
+from app.auth.user_cache import user_cache
+from app.auth.schema import (
+    CreateUserRaw,
+    UpdateUser,
+    ShowUser,
+    CreateUser,
+    UpdateUsersStatus,
+    UsersFilter,
+    UserStatusResult,
+    UsersImportReport,
+    USERS_STATUS_BATCH_SIZE,
+    USERS_STATUS_MAX_IDS,
+)
+from app.auth.user_import import ImportFormat, import_users
 from app.backend.db_depends import get_db
+from app.backend.projection import schema_columns, row_to_schema
 from app.depends.model_depends.uuid_depends import get_uuid_or_str
 
 async def _get_user_data_or_none(
         db: Annotated[AsyncSession, Depends(get_db)],
         id_or_username: Annotated[UUID | str, Field()],
-        fields: Annotated[tuple | list, Field()]
-) -> dict | None:
+        columns: Annotated[tuple | list, Field()]
+) -> Row | None:
     """
-    Return json data of a user
+    Return a row with only given columns of a user
     from a given user's id or username
+    or None if the user doesn't exist
 
     :param db: AsyncSession
     :param id_or_username: UUID | str
-    :param fields: tuple | list - Contains a collection of User model's fields
-                                  which required to return
-    :return: fields
+    :param columns: tuple | list - Contains a collection of users table's columns
+                                   which required to return
+    :return: Row | None
     """
 
-    user_values: tuple
-    user_data: dict = {}
     if isinstance(id_or_username, UUID):
-        # user = await db.scalar(select(User).where(User.id == id_or_username))
-        user_values = (
-            tuple(
-                await db
-                .scalar(
-                    select(Bundle(name="user", *User.__table__.c[*fields])
-                           )
-                    .where(User.id == id_or_username)
-                )))
+        condition = User.id == id_or_username
     elif isinstance(id_or_username, str):
-        user_values = (
-            tuple(
-                await db
-                .scalar(
-                    select(Bundle(name="user", *User.__table__.c[*fields])
-                           )
-                    .where(User.username == id_or_username)
-                )))
-        user_data.update(dict(zip(fields, user_values)))
+        condition = User.username == id_or_username
     else:
         return None
-    return user_data
+    return (await db.execute(select(*columns).where(condition))).one_or_none()
 
 
-async def _get_user_or_none(
-        db: Annotated[AsyncSession, Depends(get_db)],
-        id_or_username: Annotated[UUID | str, Field()]
-) -> User | None:
+def _user_write_condition(user_id: UUID, get_user: dict) -> ColumnElement[bool]:
     """
-    Return a User object from a given user's id or username
-    or None if the user doesn't exist
+    Return a WHERE condition which matches a user
+    only if the current user is allowed to change it:
+    anybody can change themselves, an admin can change non-admin users
+
+    :param user_id: UUID
+    :param get_user: dict - the current user
+    :return: ColumnElement[bool]
+    """
+
+    condition = User.id == user_id
+    if str(user_id) == get_user["id"]:
+        return condition
+    if get_user["is_superuser"]:
+        return and_(condition, User.is_superuser.is_(False))
+    return and_(condition, false())
+
+
+async def _get_user_write_checks(db: AsyncSession, user_id: UUID) -> Row | None:
+    """
+    Return the columns which explain why a user write matched no row
 
     :param db: AsyncSession
-    :param id_or_username: UUID | str
-    :return: User | None
+    :param user_id: UUID
+    :return: Row | None - (id, is_superuser, is_active)
     """
 
-    user: User | None = None
-    if isinstance(id_or_username, UUID):
-        user = await db.scalar(
-            select(User).where(User.id == id_or_username)
+    return (
+        await db.execute(
+            select(User.id, User.is_superuser, User.is_active).filter_by(id=user_id)
         )
-    elif isinstance(id_or_username, str):
-        user = await db.scalar(
-            select(User).where(User.username == id_or_username)
-        )
-    return user
+    ).one_or_none()
+
 
+def _users_filter_condition(users_filter: UsersFilter) -> ColumnElement[bool]:
+    conditions: list[ColumnElement[bool]] = []
+    if users_filter.email_domain is not None:
+        conditions.append(User.email.iendswith(f"@{users_filter.email_domain}", autoescape=True))
+    if users_filter.created_after is not None:
+        conditions.append(User.created_at >= users_filter.created_after)
+    if users_filter.created_before is not None:
+        conditions.append(User.created_at < users_filter.created_before)
+    return and_(*conditions)
+
+
+async def _update_users_status_batch(
+        db: AsyncSession, get_user: dict, condition: ColumnElement[bool], is_active: bool
+) -> dict[UUID, str]:
+    """
+    Flip is_active of the users matched by a condition in one UPDATE
+    which skips admins, the acting admin included, and the users already having the status,
+    commit it and drop the users from the caches
+
+    :param db: AsyncSession
+    :param get_user: dict - an admin
+    :param condition: ColumnElement[bool] - which users to update
+    :param is_active: bool - the new status
+    :return: dict - {id: username} of the updated users
+    """
+
+    updated: dict[UUID, str] = {
+        row.id: row.username
+        for row in await db.execute(
+            update(User)
+            .where(
+                condition,
+                User.is_active.is_not(is_active),
+                User.id != get_user["id"],
+                User.is_superuser.is_(False)
+            )
+            .values(is_active=is_active)
+            .returning(User.id, User.username)
+            .execution_options(synchronize_session=False)
+        )
+    }
+    await db.commit()
+    for user_id, username in updated.items():
+        if is_active:
+            token_cache.restore_user(user_id)
+        else:
+            token_cache.revoke_user(user_id)
+        await user_cache.invalidate(user_id, username)
+    return updated
 
 
 class UserManager:
@@ -94,51 +152,66 @@ class UserManager:
     @staticmethod
     async def create_user(
             db: AsyncSession, new_user_raw: CreateUserRaw
-    ) -> dict:
+    ) -> ShowUser:
         """
-        Create a user account to give back a dict with user data
+        Create a user account to give back the user data
         or get an Exception
 
         :param db: AsyncSession
         :param new_user_raw: CreateUser - (username, email, raw_password, Optional[fullname])
-        :return: dict - (id, email, username, fullname)
+        :return: ShowUser - (id, email, username, fullname)
         """
 
         new_user_data: CreateUser = CreateUser(
             **new_user_raw.model_dump(),
-            password=bcrypt_context.hash(new_user_raw.raw_password)
-        )
-        new_user: User = User(**new_user_data.model_dump())
-        await UserExceptionManager.create_user_exceptions(
-            db=db, user_data=new_user_data
+            password=await password_hasher.hash(new_user_raw.raw_password)
         )
-
-        db.add(new_user)
-        await db.commit()
-        if not new_user.id:
+        try:
+            new_user = (
+                await db.execute(
+                    insert(User)
+                    .values(**new_user_data.model_dump())
+                    .returning(*User.__table__.c[*ShowUser.model_fields])
+                )
+            ).one_or_none()
+            await db.commit()
+        except IntegrityError as error:
+            await db.rollback()
+            UserExceptionManager.create_user_exceptions(error=error)
+        if new_user is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Something got wrong with creation")
-        return ShowUser(**new_user.__dict__).model_dump()
+        return row_to_schema(new_user, ShowUser)
 
 
     @staticmethod
-    async def show_user(db: AsyncSession, id_or_username: UUID | str) -> dict:
+    async def show_user(db: AsyncSession, id_or_username: UUID | str) -> ShowUser:
         """
-        Return back a dict with user data by a user's id or username
-        or get an Exception
+        Return back the user data by a user's id or username
+        from the user cache or the DB or get an Exception.
+        Only rows of the primary are cached, a replica row may be older
+        than the last invalidation
 
         :param db: AsyncSession
         :param id_or_username: UUID | str
-        :return: dict  - (id, email, username, fullname)
+        :return: ShowUser  - (id, email, username, fullname)
         """
-        user: User | None = await _get_user_or_none(db, id_or_username)
+        user_data: ShowUser | None = await user_cache.get(id_or_username)
+        if user_data is not None:
+            return user_data
+        user: Row | None = await _get_user_data_or_none(
+            db=db, id_or_username=id_or_username, columns=schema_columns(User, ShowUser)
+        )
         UserExceptionManager.show_user_exceptions(user=user)
-        return ShowUser(**user.__dict__).model_dump()
+        user_data = row_to_schema(user, ShowUser)
+        if not db.info.get("replica"):
+            await user_cache.set(user_data)
+        return user_data
 
 
     @staticmethod
     async def update_user(
             db: AsyncSession, user_id: UUID, get_user: dict, updated_data: UpdateUser
-    ) -> dict:
+    ) -> ShowUser:
         """
         Update a user data with new updated fields by a user's id
         and return back and updated info
@@ -148,24 +221,42 @@ class UserManager:
         :param user_id: UUID
         :param get_user: dict
         :param updated_data: UpdateUser - Optional[username, fullname]
-        :return: dict - (id, email, username, fullname)
+        :return: ShowUser - (id, email, username, fullname)
         """
 
-        target_user: User | None = await db.scalar(
-            select(User).filter_by(id=user_id)
-        )
-        await UserExceptionManager.update_user_exceptions(
-            user=target_user, get_user=get_user, updated_data=updated_data, db=db
-        )
-
-        for key, value in updated_data.model_dump().items():
-            if value:
-                if getattr(target_user, key) != value:
-                    setattr(target_user, key, value)
-        if db.dirty:
+        values: dict = {
+            key: value
+            for key, value in updated_data.model_dump(exclude_unset=True).items()
+            if value is not None or User.__table__.c[key].nullable
+        }
+        condition = _user_write_condition(user_id=user_id, get_user=get_user)
+        columns = schema_columns(User, ShowUser)
+        statement = select(*columns).where(condition)
+        if values:
+            statement = (
+                update(User)
+                .where(condition)
+                .values(**values)
+                .returning(*columns)
+                .execution_options(synchronize_session=False)
+            )
+        try:
+            user: Row | None = (await db.execute(statement)).one_or_none()
             await db.commit()
-            await db.refresh(target_user)
-        return ShowUser(**target_user.__dict__).model_dump()
+        except IntegrityError as error:
+            await db.rollback()
+            unique_user_field_is_taken(error=error)
+        if user is None:
+            UserExceptionManager.update_user_exceptions(
+                user=await _get_user_write_checks(db=db, user_id=user_id), get_user=get_user
+            )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The user has been changed by another request, try again"
+            )
+        if values:
+            await user_cache.invalidate(user_id, user.username)
+        return row_to_schema(user, ShowUser)
 
 
     @staticmethod
@@ -180,17 +271,131 @@ class UserManager:
         :param get_user: dict
         :return: None
         """
-        target_user: User | None = await db.scalar(
-            select(User).filter_by(id=user_id)
-        )
-        UserExceptionManager.delete_user_exceptions(
-            user=target_user, get_user=get_user
-        )
-        target_user.is_active = False
+        user: Row | None = (
+            await db.execute(
+                update(User)
+                .where(_user_write_condition(user_id=user_id, get_user=get_user), User.is_active)
+                .values(is_active=False)
+                .returning(User.id, User.username)
+                .execution_options(synchronize_session=False)
+            )
+        ).one_or_none()
         await db.commit()
-        await db.refresh(target_user)
-        if target_user.is_active:
+        if user is None:
+            UserExceptionManager.delete_user_exceptions(
+                user=await _get_user_write_checks(db=db, user_id=user_id), get_user=get_user
+            )
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Something got wrong"
-            )
\ No newline at end of file
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The user has been changed by another request, try again"
+            )
+        token_cache.revoke_user(user_id)
+        await user_cache.invalidate(user_id, user.username)
+
+
+    @staticmethod
+    async def update_users_status(
+            db: AsyncSession, get_user: dict, status_update: UpdateUsersStatus
+    ) -> list[UserStatusResult]:
+        """
+        Deactivate or reactivate users given by ids or by a filter
+        with set-based UPDATE statements of USERS_STATUS_BATCH_SIZE users,
+        every batch is committed on its own.
+        An admin can't change other admins or deactivate themselves.
+        A filter updates at most USERS_STATUS_MAX_IDS users per request,
+        a repeated request goes on with the rest
+
+        :param db: AsyncSession
+        :param get_user: dict - an admin
+        :param status_update: UpdateUsersStatus - (is_active, ids | filter)
+        :return: list[UserStatusResult] - (user_id, status_code, detail) per given id
+                                          or per updated user of the filter
+        """
+
+        user_is_not_admin(get_user=get_user)
+        is_active: bool = status_update.is_active
+        detail: str = (
+            "User has been successfully reactivated" if is_active
+            else "User has been successfully deactivated"
+        )
+        results: list[UserStatusResult] = []
+
+        if status_update.filter is not None:
+            condition = _users_filter_condition(status_update.filter)
+            while True:
+                batch_size: int = min(USERS_STATUS_BATCH_SIZE, USERS_STATUS_MAX_IDS - len(results))
+                batch_ids = (
+                    select(User.id)
+                    .where(
+                        condition,
+                        User.is_active.is_not(is_active),
+                        User.id != get_user["id"],
+                        User.is_superuser.is_(False)
+                    )
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                updated: dict[UUID, str] = await _update_users_status_batch(
+                    db=db, get_user=get_user, condition=User.id.in_(batch_ids), is_active=is_active
+                )
+                results.extend(
+                    UserStatusResult(user_id=user_id, status_code=status.HTTP_200_OK, detail=detail)
+                    for user_id in updated
+                )
+                if len(updated) < batch_size or len(results) >= USERS_STATUS_MAX_IDS:
+                    return results
+
+        user_ids: list[UUID] = list(dict.fromkeys(status_update.ids))
+        for start in range(0, len(user_ids), USERS_STATUS_BATCH_SIZE):
+            batch: list[UUID] = user_ids[start:start + USERS_STATUS_BATCH_SIZE]
+            updated: dict[UUID, str] = await _update_users_status_batch(
+                db=db, get_user=get_user, condition=User.id.in_(batch), is_active=is_active
+            )
+            not_updated: list[UUID] = [user_id for user_id in batch if user_id not in updated]
+            checks: dict[UUID, Row] = {}
+            if not_updated:
+                checks = {
+                    row.id: row
+                    for row in await db.execute(
+                        select(User.id, User.is_superuser, User.is_active)
+                        .where(User.id.in_(not_updated))
+                    )
+                }
+            for user_id in batch:
+                if user_id in updated:
+                    results.append(UserStatusResult(
+                        user_id=user_id, status_code=status.HTTP_200_OK, detail=detail
+                    ))
+                    continue
+                try:
+                    UserExceptionManager.update_users_status_exceptions(
+                        user=checks.get(user_id), get_user=get_user, is_active=is_active
+                    )
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="The user has been changed by another request, try again"
+                    )
+                except HTTPException as error:
+                    results.append(UserStatusResult(
+                        user_id=user_id, status_code=error.status_code, detail=error.detail
+                    ))
+        return results
+
+
+    @staticmethod
+    async def import_users(
+            db: AsyncSession, get_user: dict, lines: AsyncIterator[str], file_format: ImportFormat
+    ) -> UsersImportReport:
+        """
+        Create users from a CSV or NDJSON stream in one transaction,
+        rows which can't be created are reported by line numbers
+
+        :param db: AsyncSession
+        :param get_user: dict - an admin
+        :param lines: AsyncIterator[str] - lines of the file
+        :param file_format: str - "csv" or "ndjson"
+        :return: UsersImportReport - (total, created, errors)
+        """
+
+        user_is_not_admin(get_user=get_user)
+        return await import_users(db=db, lines=lines, file_format=file_format)
@@ -0,0 +1,147 @@
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from app.backend.config import settings
+
+ACCESS_TOKEN_LIFETIME: timedelta = timedelta(minutes=20)
+
+
+class TokenCache:
+    """
+    Class which keeps the claims of already verified JWT tokens
+    in a bounded LRU dict until the token's exp claim passes,
+    and the users whose tokens are revoked until every token
+    issued before the revocation has expired
+    """
+
+    def __init__(self, max_size: int, revocation_ttl: float = ACCESS_TOKEN_LIFETIME.total_seconds()) -> None:
+        self.max_size: int = max_size
+        self.revocation_ttl: float = revocation_ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._user_digests: dict[str, set[str]] = {}
+        self._revoked: dict[str, float] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def _pop(self, digest: str) -> None:
+        _, payload = self._entries.pop(digest)
+        user_digests: set[str] | None = self._user_digests.get(str(payload.get("id")))
+        if user_digests is not None:
+            user_digests.discard(digest)
+            if not user_digests:
+                del self._user_digests[str(payload.get("id"))]
+
+    def get(self, token: str) -> dict | None:
+        """
+        Return cached claims of a token
+        or None if the token isn't cached or has been expired
+
+        :param token: str
+        :return: dict | None
+        """
+
+        digest: str = self._digest(token)
+        entry: tuple[float, dict] | None = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= time.time():
+            self._pop(digest)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, token: str, payload: dict) -> None:
+        """
+        Cache claims of a verified token until its exp claim
+
+        :param token: str
+        :param payload: dict - decoded claims of the token
+        :return: None
+        """
+
+        if self.max_size <= 0 or payload.get("exp") is None:
+            return
+        digest: str = self._digest(token)
+        if digest in self._entries:
+            self._pop(digest)
+        self._entries[digest] = (float(payload["exp"]), payload)
+        self._user_digests.setdefault(str(payload.get("id")), set()).add(digest)
+        while len(self._entries) > self.max_size:
+            self._pop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_user(self, user_id) -> None:
+        """
+        Drop all cached tokens of a user
+
+        :param user_id: UUID | str
+        :return: None
+        """
+
+        for digest in list(self._user_digests.get(str(user_id), ())):
+            self._pop(digest)
+            self.invalidations += 1
+
+    def revoke_user(self, user_id) -> None:
+        """
+        Drop all cached tokens of a user and reject the user's tokens
+        for the lifetime of an access token
+
+        :param user_id: UUID | str
+        :return: None
+        """
+
+        self.invalidate_user(user_id)
+        self._revoked[str(user_id)] = time.monotonic() + self.revocation_ttl
+
+    def restore_user(self, user_id) -> None:
+        self._revoked.pop(str(user_id), None)
+
+    def is_revoked(self, user_id) -> bool:
+        """
+        Return whether tokens of a user have been revoked
+
+        :param user_id: UUID | str
+        :return: bool
+        """
+
+        deadline: float | None = self._revoked.get(str(user_id))
+        if deadline is None:
+            return False
+        if deadline <= time.monotonic():
+            del self._revoked[str(user_id)]
+            return False
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._user_digests.clear()
+        self._revoked.clear()
+
+    def metrics(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "revoked_users": len(self._revoked),
+        }
+
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
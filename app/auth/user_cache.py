@@ -0,0 +1,166 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+from app.auth.schema import ShowUser
+from app.backend.config import settings
+
+
+class UserCacheBackend(ABC):
+    """
+    Storage of cached users.
+    Only in-process storage exists now, a shared one (e.g. Redis)
+    has to implement the same methods and serialize the values itself
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """
+        Return a value which hasn't been expired or None
+
+        :param key: str
+        :return: Any | None
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Keep a value for ttl seconds
+
+        :param key: str
+        :param value: Any
+        :param ttl: float
+        :return: None
+        """
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+
+class InMemoryUserCacheBackend(UserCacheBackend):
+    def __init__(self, max_size: int) -> None:
+        self.max_size: int = max_size
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.evictions: int = 0
+
+    async def get(self, key: str) -> Any | None:
+        entry: tuple[float, Any] | None = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class UserCache:
+    """
+    Class which keeps shown users data for a short time.
+    A user is stored by id and the username points to the id,
+    so both kinds of lookups share one entry
+    """
+
+    def __init__(self, backend: UserCacheBackend, ttl: float, enabled: bool = True) -> None:
+        self.backend: UserCacheBackend = backend
+        self.ttl: float = ttl
+        self.enabled: bool = enabled
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    async def get(self, id_or_username: UUID | str) -> ShowUser | None:
+        """
+        Return cached data of a user by id or username
+        or None if the user isn't cached
+
+        :param id_or_username: UUID | str
+        :return: ShowUser | None
+        """
+
+        if not self.enabled:
+            return None
+        user_id: UUID | None = (
+            id_or_username if isinstance(id_or_username, UUID)
+            else await self.backend.get(f"username:{id_or_username}")
+        )
+        user: ShowUser | None = (
+            await self.backend.get(f"id:{user_id}") if user_id is not None else None
+        )
+        if user is None or (
+                isinstance(id_or_username, str) and user.username != id_or_username
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return user
+
+    async def set(self, user: ShowUser) -> None:
+        if not self.enabled:
+            return
+        await self.backend.set(f"id:{user.id}", user, self.ttl)
+        await self.backend.set(f"username:{user.username}", user.id, self.ttl)
+
+    async def invalidate(self, user_id: UUID, *usernames: str) -> None:
+        """
+        Drop a cached user and the given usernames pointing to it
+
+        :param user_id: UUID
+        :param usernames: str - the user's current and previous usernames
+        :return: None
+        """
+
+        if not self.enabled:
+            return
+        await self.backend.delete(
+            f"id:{user_id}", *(f"username:{username}" for username in usernames)
+        )
+        self.invalidations += 1
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def metrics(self) -> dict:
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "invalidations": self.invalidations,
+        }
+
+
+user_cache = UserCache(
+    backend=InMemoryUserCacheBackend(max_size=settings.USER_CACHE_SIZE),
+    ttl=settings.USER_CACHE_TTL,
+    enabled=settings.USER_CACHE_SIZE > 0 and settings.USER_CACHE_TTL > 0
+)
@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import csv
+from typing import AsyncIterator, Literal
+from uuid import uuid4
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import Integer, Text, UUID, case, column, exists, func, select, table, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.hashing import password_hasher
+from app.auth.model import User
+from app.auth.schema import (
+    CreateUserRaw,
+    UserImportError,
+    UsersImportReport,
+    USERS_IMPORT_CHUNK_SIZE,
+)
+from app.backend.db import async_session_maker
+from app.backend.streaming import iter_lines
+
+ImportFormat = Literal["csv", "ndjson"]
+
+STAGING_COLUMNS: tuple[str, ...] = ("line", "id", "email", "username", "fullname", "password")
+
+users_import = table(
+    "users_import",
+    column("line", Integer),
+    column("id", UUID(as_uuid=True)),
+    column("email", Text),
+    column("username", Text),
+    column("fullname", Text),
+    column("password", Text),
+    column("error", Text),
+)
+
+
+async def _iter_rows(
+        lines: AsyncIterator[str], file_format: ImportFormat
+) -> AsyncIterator[tuple[int, dict | str]]:
+    """
+    Return (line number, row) of CSV lines with a header or of NDJSON lines,
+    a line which can't be parsed is returned with an error instead of a row.
+    CSV values can't contain line breaks
+
+    :param lines: AsyncIterator[str]
+    :param file_format: str - "csv" or "ndjson"
+    :return: AsyncIterator[tuple[int, dict | str]]
+    """
+
+    header: list[str] | None = None
+    line_number: int = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        if file_format == "ndjson":
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                yield line_number, "Invalid JSON"
+                continue
+            yield line_number, row if isinstance(row, dict) else "A line has to be a JSON object"
+            continue
+        values: list[str] = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_number, f"Expected {len(header)} values, got {len(values)}"
+            continue
+        yield line_number, {name: value or None for name, value in zip(header, values)}
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+async def _copy_chunk(driver_connection, chunk: list[tuple[int, CreateUserRaw]]) -> None:
+    """
+    Hash passwords of a chunk of validated users on all the hashing workers
+    and COPY the users into the staging table
+
+    :param driver_connection: asyncpg.Connection
+    :param chunk: list - (line number, user)
+    :return: None
+    """
+
+    passwords: list[str] = await password_hasher.hash_many([user.raw_password for _, user in chunk])
+    await driver_connection.copy_records_to_table(
+        "users_import",
+        records=[
+            (line, uuid4(), user.email, user.username, user.fullname, password)
+            for (line, user), password in zip(chunk, passwords)
+        ],
+        columns=STAGING_COLUMNS
+    )
+
+
+async def _mark_duplicates(db: AsyncSession) -> None:
+    """
+    Set an error on every staged user whose values don't fit users columns
+    or whose username or email is already taken in users table,
+    then on every user whose username or email is repeated
+    by an earlier line of the file which is still valid
+
+    :param db: AsyncSession
+    :return: None
+    """
+
+    await db.execute(
+        update(users_import).values(
+            error=case(
+                *(
+                    (
+                        func.length(users_import.c[name]) > User.__table__.c[name].type.length,
+                        f"{name}: String should have at most "
+                        f"{User.__table__.c[name].type.length} characters"
+                    )
+                    for name in ("username", "email", "fullname")
+                ),
+                (
+                    exists().where(User.username == users_import.c.username),
+                    "This username is already taken"
+                ),
+                (
+                    exists().where(User.email == users_import.c.email),
+                    "This email is already taken"
+                ),
+            )
+        )
+    )
+    # the UPDATE sees the errors of the previous one, so an invalid line doesn't block its repeats
+    other = users_import.alias()
+    await db.execute(
+        update(users_import)
+        .where(users_import.c.error.is_(None))
+        .values(
+            error=case(
+                (
+                    exists().where(
+                        other.c.username == users_import.c.username,
+                        other.c.line < users_import.c.line,
+                        other.c.error.is_(None)
+                    ),
+                    "This username is repeated in the file"
+                ),
+                (
+                    exists().where(
+                        other.c.email == users_import.c.email,
+                        other.c.line < users_import.c.line,
+                        other.c.error.is_(None)
+                    ),
+                    "This email is repeated in the file"
+                ),
+            )
+        )
+    )
+
+
+async def import_users(
+        db: AsyncSession, lines: AsyncIterator[str], file_format: ImportFormat
+) -> UsersImportReport:
+    """
+    Create users from CSV or NDJSON lines in one transaction:
+    rows are validated with CreateUserRaw, hashed and copied into a temporary
+    staging table by chunks, then duplicates are marked set-wise
+    and the rest is inserted with one INSERT ... SELECT
+
+    :param db: AsyncSession
+    :param lines: AsyncIterator[str] - a CSV with a header or NDJSON
+    :param file_format: str - "csv" or "ndjson"
+    :return: UsersImportReport - (total, created, errors)
+    """
+
+    await db.execute(text(
+        "CREATE TEMPORARY TABLE users_import ("
+        "line integer PRIMARY KEY, id uuid NOT NULL, email text NOT NULL, "
+        "username text NOT NULL, fullname text, password text NOT NULL, error text"
+        ") ON COMMIT DROP"
+    ))
+    driver_connection = (await (await db.connection()).get_raw_connection()).driver_connection
+
+    errors: list[UserImportError] = []
+    total: int = 0
+    chunk: list[tuple[int, CreateUserRaw]] = []
+    async for line, row in _iter_rows(lines, file_format):
+        total += 1
+        if isinstance(row, str):
+            errors.append(UserImportError(line=line, detail=row))
+            continue
+        try:
+            chunk.append((line, CreateUserRaw.model_validate(row)))
+        except ValidationError as error:
+            errors.append(UserImportError(line=line, detail=_validation_detail(error)))
+            continue
+        if len(chunk) >= USERS_IMPORT_CHUNK_SIZE:
+            await _copy_chunk(driver_connection, chunk)
+            chunk = []
+    if chunk:
+        await _copy_chunk(driver_connection, chunk)
+
+    await db.execute(text("CREATE INDEX ON users_import (username)"))
+    await db.execute(text("CREATE INDEX ON users_import (email)"))
+    await db.execute(text("ANALYZE users_import"))
+    await _mark_duplicates(db)
+    created: int = len((
+        await db.execute(
+            insert(User)
+            .from_select(
+                # is_active, is_superuser, role and created_at get the model defaults
+                ["id", "email", "username", "fullname", "password"],
+                select(
+                    users_import.c.id,
+                    users_import.c.email,
+                    users_import.c.username,
+                    users_import.c.fullname,
+                    users_import.c.password,
+                )
+                .where(users_import.c.error.is_(None))
+                .order_by(users_import.c.line)
+            )
+            .on_conflict_do_nothing()
+            .returning(User.id)
+        )
+    ).all())
+    # users created by concurrent requests after the duplicates have been marked
+    await db.execute(
+        update(users_import)
+        .where(
+            users_import.c.error.is_(None),
+            ~exists().where(User.id == users_import.c.id)
+        )
+        .values(error="This username or email is already taken")
+    )
+    errors.extend(
+        UserImportError(line=line, detail=error)
+        for line, error in await db.execute(
+            select(users_import.c.line, users_import.c.error)
+            .where(users_import.c.error.is_not(None))
+        )
+    )
+    await db.commit()
+    errors.sort(key=lambda error: error.line)
+    return UsersImportReport(total=total, created=created, errors=errors)
+
+
+async def _iter_file(path: str, chunk_size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := await asyncio.to_thread(file.read, chunk_size):
+            yield chunk
+
+
+async def import_users_from_file(path: str, file_format: ImportFormat) -> UsersImportReport:
+    async with async_session_maker() as db:
+        return await import_users(db=db, lines=iter_lines(_iter_file(path)), file_format=file_format)
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Import users from a CSV or NDJSON file")
+    parser.add_argument("path", help="a CSV with a header (username,email,raw_password,fullname) or NDJSON")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="by default by the file extension")
+    parsed = parser.parse_args(args)
+    file_format: ImportFormat = parsed.format or ("csv" if parsed.path.endswith(".csv") else "ndjson")
+    report: UsersImportReport = asyncio.run(import_users_from_file(parsed.path, file_format))
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status, HTTPException, Path
+from fastapi import APIRouter, Depends, status, HTTPException, Path, Query, Request
 # from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from sqlalchemy import select, update
 
@@ -9,62 +9,129 @@ from app.depends.model_depends.uuid_depends import get_uuid_or_str
 from app.auth.model import User
 from app.auth.auth_router import get_current_user
 from app.backend.config import ROOT_API
-from app.auth.schema import CreateUserRaw, ShowUser, UpdateUser
-from app.backend.db_depends import get_db
+from app.auth.schema import (
+    CreateUserRaw, ShowUser, UpdateUser, UpdateUsersStatus, UserStatusResult, UsersImportReport
+)
+from app.auth.user_import import ImportFormat
+from app.backend.db_depends import get_db, get_read_db
+from app.backend.responses import ResponseSchema, SchemaResponse
+from app.backend.streaming import iter_lines
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix=ROOT_API + "/users", tags=["users"])
 
-@router.post(path="/", status_code=status.HTTP_201_CREATED, response_model=dict)
+@router.post(path="/", status_code=status.HTTP_201_CREATED, response_model=ResponseSchema[ShowUser])
 async def create_user(
         db: Annotated[AsyncSession, Depends(get_db)],
         new_user_raw: CreateUserRaw
-) -> dict:
+) -> SchemaResponse:
     """
     Create user and return a response with user data
 
     :param db: AsyncSession
     :param new_user_raw: CreateUser - (username, email, raw_password, Optional[fullname])
-    :return: dict - (data: user_data, status_code, detail)
+    :return: SchemaResponse - (data: user_data, status_code, detail)
     """
-    user_data: dict = await UserManager.create_user(db=db, new_user_raw=new_user_raw)
-    return {
-        "data": user_data,
-        "status_code": status.HTTP_201_CREATED,
-        "detail": "Successful"
-    }
+    user_data: ShowUser = await UserManager.create_user(db=db, new_user_raw=new_user_raw)
+    return SchemaResponse(
+        ResponseSchema[ShowUser](
+            data=user_data,
+            status_code=status.HTTP_201_CREATED,
+            detail="Successful"
+        ),
+        status_code=status.HTTP_201_CREATED
+    )
 
 
-@router.get("/{id_or_username}", response_model=dict)
-async def show_user(
+@router.post(path="/status", response_model=ResponseSchema[list[UserStatusResult]])
+async def update_users_status(
         db: Annotated[AsyncSession, Depends(get_db)],
         get_user: Annotated[dict, Depends(get_current_user)],
+        status_update: UpdateUsersStatus
+) -> SchemaResponse:
+    """
+    Deactivate or reactivate users by a list of ids or by a filter
+    and return a response with a result for every user
+
+    :param db: AsyncSession
+    :param get_user: dict - an admin who requires the update
+    :param status_update: UpdateUsersStatus - (is_active, ids | filter)
+    :return: SchemaResponse - (data: [(user_id, status_code, detail)], status_code, detail)
+    """
+    results: list[UserStatusResult] = await UserManager.update_users_status(
+        db=db, get_user=get_user, status_update=status_update
+    )
+    return SchemaResponse(
+        ResponseSchema[list[UserStatusResult]](
+            data=results,
+            status_code=status.HTTP_200_OK,
+            detail="Successful"
+        )
+    )
+
+
+@router.post(path="/import", response_model=ResponseSchema[UsersImportReport])
+async def import_users(
+        db: Annotated[AsyncSession, Depends(get_db)],
+        get_user: Annotated[dict, Depends(get_current_user)],
+        request: Request,
+        file_format: Annotated[ImportFormat, Query(alias="format")] = "ndjson"
+) -> SchemaResponse:
+    """
+    Create users from a request body streamed as NDJSON
+    or as CSV with a header (username, email, raw_password, fullname)
+    and return a response with an import report
+
+    :param db: AsyncSession
+    :param get_user: dict - an admin who requires the import
+    :param request: Request - the body is read by chunks
+    :param file_format: str - "ndjson" or "csv"
+    :return: SchemaResponse - (data: (total, created, errors), status_code, detail)
+    """
+    report: UsersImportReport = await UserManager.import_users(
+        db=db, get_user=get_user, lines=iter_lines(request.stream()), file_format=file_format
+    )
+    return SchemaResponse(
+        ResponseSchema[UsersImportReport](
+            data=report,
+            status_code=status.HTTP_200_OK,
+            detail="Successful"
+        )
+    )
+
+
+@router.get("/{id_or_username}", response_model=ResponseSchema[ShowUser])
+async def show_user(
+        db: Annotated[AsyncSession, Depends(get_read_db)],
+        get_user: Annotated[dict, Depends(get_current_user)],
         id_or_username: Annotated[UUID | str, Depends(get_uuid_or_str)]
-) -> dict:
+) -> SchemaResponse:
     """
     Return response with a user data by user's id or username
 
     :param db: AsyncSession
     :param id_or_username: str | UUID
     :param get_user: dict - the user who requires to show a user by id
-    :return: dict - (data: user_data, status_code, detail)
+    :return: SchemaResponse - (data: user_data, status_code, detail)
     """
-    user_data: dict  = await UserManager.show_user(db=db, id_or_username=id_or_username)
-    return {
-        "data": user_data,
-        "status_code": status.HTTP_200_OK,
-        "detail": "Successful"
-    }
+    user_data: ShowUser = await UserManager.show_user(db=db, id_or_username=id_or_username)
+    return SchemaResponse(
+        ResponseSchema[ShowUser](
+            data=user_data,
+            status_code=status.HTTP_200_OK,
+            detail="Successful"
+        )
+    )
 
 
-@router.put("/{user_id}", response_model=dict)
+@router.put("/{user_id}", response_model=ResponseSchema[ShowUser])
 async def update_user(
         db: Annotated[AsyncSession, Depends(get_db)],
         get_user: Annotated[dict, Depends(get_current_user)],
         user_id: Annotated[UUID, Path()],
         updated_data: UpdateUser
-) -> dict:
+) -> SchemaResponse:
     """
     Update a user data by user's id and return a response with user's data
 
@@ -72,35 +139,39 @@ async def update_user(
     :param get_user: dict - the user who requires an update
     :param user_id: UUID - user's id which data needs to be updated
     :param updated_data: dict - Optional[username, fullname]
-    :return: dict - (data: user_data, status_code, detail)
+    :return: SchemaResponse - (data: user_data, status_code, detail)
     """
-    user_data: dict =  await UserManager.update_user(
+    user_data: ShowUser = await UserManager.update_user(
         db=db, get_user=get_user, user_id=user_id, updated_data=updated_data
     )
-    return {
-        "data": user_data,
-        "status_code": status.HTTP_200_OK,
-        "detail": "User has been successfully updated"
-    }
+    return SchemaResponse(
+        ResponseSchema[ShowUser](
+            data=user_data,
+            status_code=status.HTTP_200_OK,
+            detail="User has been successfully updated"
+        )
+    )
 
 
-@router.delete("/{user_id}", response_model=dict)
+@router.delete("/{user_id}", response_model=ResponseSchema[None])
 async def delete_user(
         db: Annotated[AsyncSession, Depends(get_db)],
         get_user: Annotated[dict, Depends(get_current_user)],
         user_id: Annotated[UUID, Path()],
-) -> dict:
+) -> SchemaResponse:
     """
     Make a user inactive by user's id
 
     :param db: AsyncSession
     :param get_user: dict - the user who requires an update
     :param user_id: UUID - user's id which data needs to be updated
-    :return: dict - (data: user_data, status_code, detail)
+    :return: SchemaResponse - (data: user_data, status_code, detail)
     """
     await UserManager.delete_user(db=db, get_user=get_user, user_id=user_id)
-    return {
-        "status_code": status.HTTP_200_OK,
-        "detail": "User has been successfully deleted"
-    }
+    return SchemaResponse(
+        ResponseSchema[None](
+            status_code=status.HTTP_200_OK,
+            detail="User has been successfully deleted"
+        )
+    )
 
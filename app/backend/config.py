@@ -1,10 +1,42 @@
+import os
 import pathlib
+from typing import Literal
 
 from pydantic import Extra
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 ROOT_API: str = "/api/v1"
 
+DB_ENGINE_DEFAULTS: dict[str, dict] = {
+    "DEV": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_cache_size": 100,
+    },
+    "TEST": {
+        "echo": False,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_cache_size": 100,
+    },
+    "PROD": {
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 500,
+    },
+}
+
 class Settings(BaseSettings):
     MODE: str
     SQL_PATH: str
@@ -13,6 +45,61 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
 
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    TOKEN_CACHE_SIZE: int = 10_000
+    # the cache is per process, other workers see a change after the TTL
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL: float = 30
+
+    RATE_LIMIT_ENABLED: bool | None = None
+    # "<path prefix>": "<amount>/<second|minute|hour|day>", the longest prefix wins
+    RATE_LIMITS: dict[str, str] = {
+        "default": "300/minute",
+        "/auth/token": "10/minute",
+    }
+
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8888
+    # the amount of CPU cores by default
+    SERVER_WORKERS: int | None = None
+    SERVER_LOOP: Literal["auto", "asyncio", "uvloop"] = "auto"
+    SERVER_HTTP: Literal["auto", "h11", "httptools"] = "auto"
+    SERVER_RELOAD: bool = False
+    SERVER_KEEPALIVE: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_SHUTDOWN: int | None = 30
+
+    REQUEST_METRICS_ENABLED: bool = True
+    # a request which issues more queries is logged as a possible N+1
+    N_PLUS_ONE_QUERY_THRESHOLD: int = 10
+    EVENT_LOOP_LAG_INTERVAL: float = 0.5
+    # logs the stack of the code which blocks the loop longer than the threshold
+    EVENT_LOOP_WATCHDOG_ENABLED: bool = False
+    EVENT_LOOP_WATCHDOG_THRESHOLD: float = 0.1
+
+    DB_ECHO: bool | Literal["debug"] | None = None
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: float | None = None
+    DB_POOL_RECYCLE: int | None = None
+    DB_POOL_PRE_PING: bool | None = None
+    DB_STATEMENT_CACHE_SIZE: int | None = None
+    # Postgres max_connections which pools of all workers have to fit in
+    DB_MAX_CONNECTIONS: int | None = None
+    # connections left for migrations, psql and monitoring
+    DB_RESERVED_CONNECTIONS: int = 5
+    # connections opened on startup, the pool_size by default
+    DB_WARMUP_CONNECTIONS: int | None = None
+    # a read-only replica for GET routes in the SQL_PATH format, the primary by default.
+    # SQL_READ_PATH=SQL_PATH gives reads a separate read-only pool of the same DB.
+    # The read pool has the same options, when it is on the primary's server
+    # the launcher splits DB_MAX_CONNECTIONS between both pools of a worker
+    SQL_READ_PATH: str | None = None
+    # seconds a client reads from the primary after a write request,
+    # the deadline is signed with SECRET_KEY and sent in a cookie and X-Read-Primary-Until
+    DB_READ_STICKY_SECONDS: float = 5
+
     @property
     def DATABASE_URL_async(self) -> str:
         return f"{self.ASYNC_ENGINE}:{self.SQL_PATH}"
@@ -21,6 +108,46 @@ class Settings(BaseSettings):
     def DATABASE_URL_sync(self) -> str:
         return f"{self.SYNC_ENGINE}:{self.SQL_PATH}"
 
+    @property
+    def DATABASE_URL_read_async(self) -> str | None:
+        if self.SQL_READ_PATH is None:
+            return None
+        return f"{self.ASYNC_ENGINE}:{self.SQL_READ_PATH}"
+
+    @property
+    def rate_limit_enabled(self) -> bool:
+        if self.RATE_LIMIT_ENABLED is not None:
+            return self.RATE_LIMIT_ENABLED
+        return self.MODE != "TEST"
+
+    @property
+    def db_engine_options(self) -> dict:
+        """
+        Return engine and pool options of the current MODE
+        overridden by the DB_* values which are set explicitly
+
+        :return: dict - (echo, pool_size, max_overflow, pool_timeout,
+                         pool_recycle, pool_pre_ping, statement_cache_size)
+        """
+
+        options: dict = dict(DB_ENGINE_DEFAULTS.get(self.MODE, DB_ENGINE_DEFAULTS["PROD"]))
+        overrides: dict = {
+            "echo": self.DB_ECHO,
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return options
+
+    @property
+    def db_warmup_connections(self) -> int:
+        if self.DB_WARMUP_CONNECTIONS is not None:
+            return self.DB_WARMUP_CONNECTIONS
+        return self.db_engine_options["pool_size"]
 
     model_config = SettingsConfigDict(
         env_file=f"{pathlib.Path(__file__).resolve().parent.parent.parent}/.env",
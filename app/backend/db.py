@@ -1,23 +1,52 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
+
+from sqlalchemy import Engine
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
 from app.backend.config import settings
 
-# with sync_engine.connect() as conn:
+# with get_sync_engine().connect() as conn:
 #     res = conn.execute(text('SELECT VERSION()'))
 #     print(f'{res=}')
 #
 
-sync_engine = create_engine(
-    url=settings.DATABASE_URL_sync,
-    echo=True
-)
+def _engine_kwargs(url: str) -> dict:
+    """
+    Return create_engine() kwargs from the settings' engine options
+
+    :param url: str - a database url of the engine
+    :return: dict
+    """
+
+    options: dict = settings.db_engine_options
+    statement_cache_size: int = options.pop("statement_cache_size")
+    if "asyncpg" in url:
+        options["connect_args"] = {"statement_cache_size": statement_cache_size}
+    return options
+
+
+@lru_cache(maxsize=1)
+def get_sync_engine() -> Engine:
+    """
+    Return the sync (psycopg) engine, creating it on the first call.
+    Only tests, migrations and admin scripts need it,
+    so API workers never import the sync driver
+
+    :return: Engine
+    """
+
+    from sqlalchemy import create_engine
+
+    return create_engine(
+        url=settings.DATABASE_URL_sync,
+        **_engine_kwargs(settings.DATABASE_URL_sync)
+    )
 
 
 async_engine = create_async_engine(
     url=settings.DATABASE_URL_async,
-    echo=True
+    **_engine_kwargs(settings.DATABASE_URL_async)
 )
 
 async_session_maker = async_sessionmaker(
@@ -26,5 +55,24 @@ async_session_maker = async_sessionmaker(
     class_=AsyncSession
 )
 
+# Transactions of the read engine are READ ONLY,
+# so a write sent to it fails even when it points to the primary
+async_read_engine = (
+    create_async_engine(
+        url=settings.DATABASE_URL_read_async,
+        execution_options={"postgresql_readonly": True},
+        **_engine_kwargs(settings.DATABASE_URL_read_async)
+    )
+    if settings.DATABASE_URL_read_async is not None else async_engine
+)
+
+# info["replica"] tells the services that rows of the session may lag behind the primary
+async_read_session_maker = async_sessionmaker(
+    bind=async_read_engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    info={"replica": async_read_engine is not async_engine}
+)
+
 class Base(DeclarativeBase):
     pass
\ No newline at end of file
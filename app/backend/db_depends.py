@@ -1,7 +1,27 @@
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.backend.db import async_session_maker
+from app.backend.db import async_engine, async_read_engine, async_session_maker, async_read_session_maker
+from app.backend.read_routing import SAFE_METHODS, primary_stickiness
 
 
-async def get_db() -> AsyncSession:
+async def get_db(request: Request) -> AsyncSession:
     async with async_session_maker() as session:
-        yield session
\ No newline at end of file
+        yield session
+        if async_read_engine is not async_engine and request.method not in SAFE_METHODS:
+            primary_stickiness.mark_write(request)
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """
+    Return a session of the read engine for routes which only read,
+    a client who has just written reads from the primary
+
+    :param request: Request
+    :return: AsyncSession
+    """
+
+    session_maker = async_session_maker
+    if async_read_engine is not async_engine and not primary_stickiness.reads_from_primary(request):
+        session_maker = async_read_session_maker
+    async with session_maker() as session:
+        yield session
@@ -0,0 +1,190 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.backend.metrics import DEFAULT_COUNT_BUCKETS, Histogram
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE: str = "<unmatched>"
+
+
+def _get_route_path(scope: Scope) -> str:
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+@dataclass(slots=True)
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+
+
+@dataclass(slots=True)
+class RouteStats:
+    requests: int = 0
+    queries: int = 0
+    rows: int = 0
+    n_plus_one: int = 0
+    duration: Histogram = field(default_factory=Histogram)
+    db_duration: Histogram = field(default_factory=Histogram)
+    query_count: Histogram = field(default_factory=lambda: Histogram(DEFAULT_COUNT_BUCKETS))
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "rows": self.rows,
+            "n_plus_one": self.n_plus_one,
+            "duration_seconds": self.duration.snapshot(),
+            "db_duration_seconds": self.db_duration.snapshot(),
+            "queries_per_request": self.query_count.snapshot(),
+        }
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class RequestMetrics:
+    """
+    In-process registry of per route request statistics
+    keyed by (method, route template)
+    """
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self.in_flight: dict[int, Scope] = {}
+
+    def record(
+            self, method: str, route: str, duration: float, stats: RequestStats, n_plus_one: bool
+    ) -> None:
+        route_stats: RouteStats | None = self.routes.get((method, route))
+        if route_stats is None:
+            route_stats = self.routes[(method, route)] = RouteStats()
+        route_stats.requests += 1
+        route_stats.queries += stats.queries
+        route_stats.rows += stats.rows
+        route_stats.n_plus_one += n_plus_one
+        route_stats.duration.observe(duration)
+        route_stats.db_duration.observe(stats.db_seconds)
+        route_stats.query_count.observe(stats.queries)
+
+    def in_flight_by_route(self) -> Counter[str]:
+        """
+        Return the amount of the requests being handled now per route template.
+        A request which hasn't been routed yet is counted as unmatched
+
+        :return: Counter - {route template: amount}
+        """
+
+        return Counter(
+            _get_route_path(scope) for scope in list(self.in_flight.values())
+        )
+
+    def clear(self) -> None:
+        self.routes.clear()
+
+    def snapshot(self) -> list[dict]:
+        return [
+            {"method": method, "route": route, **route_stats.snapshot()}
+            for (method, route), route_stats in sorted(self.routes.items())
+        ]
+
+
+request_metrics = RequestMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _request_stats.get() is not None:
+        conn.info["query_started_at"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats: RequestStats | None = _request_stats.get()
+    started_at: float | None = conn.info.pop("query_started_at", None)
+    if stats is None or started_at is None:
+        return
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - started_at
+    if cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """
+    Count queries, their time and affected rows of the current request.
+    For an AsyncEngine pass its sync_engine
+
+    :param engine: Engine
+    :return: None
+    """
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    ASGI middleware which measures a request's wall time and DB usage,
+    adds them to the response as a Server-Timing header
+    and records them per route template in RequestMetrics
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            metrics: RequestMetrics,
+            n_plus_one_threshold: int
+    ) -> None:
+        self.app: ASGIApp = app
+        self.metrics: RequestMetrics = metrics
+        self.n_plus_one_threshold: int = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started_at: float = time.perf_counter()
+        self.metrics.in_flight[id(scope)] = scope
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total_ms: float = (time.perf_counter() - started_at) * 1000
+                db_ms: float = stats.db_seconds * 1000
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'app;dur={total_ms - db_ms:.2f}, '
+                    f'db;dur={db_ms:.2f};desc="{stats.queries} queries", '
+                    f'total;dur={total_ms:.2f}'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            self.metrics.in_flight.pop(id(scope), None)
+            route_path: str = _get_route_path(scope)
+            n_plus_one: bool = stats.queries > self.n_plus_one_threshold
+            if n_plus_one:
+                logger.warning(
+                    "Possible N+1: %s %s issued %d queries",
+                    scope["method"], route_path, stats.queries
+                )
+            self.metrics.record(
+                method=scope["method"],
+                route=route_path,
+                duration=time.perf_counter() - started_at,
+                stats=stats,
+                n_plus_one=n_plus_one
+            )
@@ -0,0 +1,191 @@
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Iterable
+
+from starlette.routing import BaseRoute, Mount
+
+from app.backend.config import settings
+from app.backend.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_ROUTE: str = "<unknown>"
+
+EVENT_LOOP_LAG_BUCKETS: tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+
+class EventLoopLagMonitor:
+    """
+    Class which measures how late the event loop wakes up a task
+    sleeping for a fixed interval. The delay is the time the loop
+    was busy with other callbacks or blocked by synchronous code
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval: float = interval
+        self.last_lag: float = 0.0
+        self.max_lag: float = 0.0
+        self.lag: Histogram = Histogram(EVENT_LOOP_LAG_BUCKETS)
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            expected_at: float = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(time.monotonic() - expected_at, 0.0)
+            self.max_lag = max(self.max_lag, self.last_lag)
+            self.lag.observe(self.last_lag)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name="event-loop-lag-monitor"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def metrics(self) -> dict:
+        return {
+            "interval": self.interval,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "samples": self.lag.count,
+        }
+
+
+def get_endpoint_routes(routes: Iterable[BaseRoute], prefix: str = "") -> dict[CodeType, str]:
+    """
+    Return route templates by the code objects of their endpoints,
+    routes of mounted apps get the mount's path as a prefix
+
+    :param routes: Iterable[BaseRoute]
+    :param prefix: str - path of the mount
+    :return: dict - {endpoint's code: route template}
+    """
+
+    endpoint_routes: dict[CodeType, str] = {}
+    for route in routes:
+        if isinstance(route, Mount):
+            endpoint_routes.update(get_endpoint_routes(route.routes, prefix + route.path))
+            continue
+        code: CodeType | None = getattr(getattr(route, "endpoint", None), "__code__", None)
+        if code is not None:
+            endpoint_routes.setdefault(code, prefix + getattr(route, "path", ""))
+    return endpoint_routes
+
+
+class EventLoopWatchdog:
+    """
+    Class which detects a blocked event loop from a separate thread.
+    A task on the loop beats every half of the threshold, when a beat is late
+    more than the threshold the thread logs the stack of the loop's thread
+    and the route whose endpoint is on that stack
+    """
+
+    def __init__(self, threshold: float) -> None:
+        self.threshold: float = threshold
+        self.check_interval: float = threshold / 2
+        self.stalls: int = 0
+        self.route_stalls: Counter[str] = Counter()
+        self.max_stall: float = 0.0
+        self._routes: dict[CodeType, str] = {}
+        self._beat: float = 0.0
+        self._reported_beat: float | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped: threading.Event = threading.Event()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            now: float = time.monotonic()
+            self.max_stall = max(self.max_stall, now - self._beat)
+            self._beat = now + self.check_interval
+
+    def _find_route(self, frame: FrameType | None) -> str:
+        while frame is not None:
+            route: str | None = self._routes.get(frame.f_code)
+            if route is not None:
+                return route
+            frame = frame.f_back
+        return UNKNOWN_ROUTE
+
+    def _report(self, stall: float) -> None:
+        frame: FrameType | None = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        route: str = self._find_route(frame)
+        self.stalls += 1
+        self.route_stalls[route] += 1
+        logger.warning(
+            "Event loop is blocked for %.3fs by route %s\n%s",
+            stall, route, "".join(traceback.format_stack(frame))
+        )
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.check_interval):
+            beat: float = self._beat
+            stall: float = time.monotonic() - beat
+            if stall >= self.threshold and beat != self._reported_beat:
+                self._reported_beat = beat
+                self._report(stall)
+
+    def start(self, routes: Iterable[BaseRoute] = ()) -> None:
+        """
+        Start the heartbeat task on the running loop and the watching thread
+
+        :param routes: Iterable[BaseRoute] - routes of the app to name a blocking endpoint
+        :return: None
+        """
+
+        if self._task is not None:
+            return
+        self._routes = get_endpoint_routes(routes)
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic() + self.check_interval
+        self._task = asyncio.get_running_loop().create_task(
+            self._heartbeat(), name="event-loop-watchdog"
+        )
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._thread.join()
+        self._thread = None
+
+    def metrics(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "stalls": self.stalls,
+            "max_stall": self.max_stall,
+            "route_stalls": dict(self.route_stalls),
+        }
+
+
+loop_monitor = EventLoopLagMonitor(interval=settings.EVENT_LOOP_LAG_INTERVAL)
+loop_watchdog = EventLoopWatchdog(threshold=settings.EVENT_LOOP_WATCHDOG_THRESHOLD)
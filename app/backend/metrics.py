@@ -0,0 +1,133 @@
+import math
+from bisect import bisect_left
+from typing import Iterable
+
+DEFAULT_DURATION_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+DEFAULT_COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """
+    Class which counts observed values in fixed buckets.
+    An observation is a bisect and two additions, so it is cheap enough
+    to be done on every request
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_DURATION_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self._counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """
+        Return cumulative counts of the buckets ending with +Inf
+
+        :return: list - [(upper bound, amount of values <= upper bound)]
+        """
+
+        result: list[tuple[float, int]] = []
+        total: int = 0
+        for bound, count in zip((*self.buckets, float("inf")), self._counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {
+                "+Inf" if bound == float("inf") else str(bound): count
+                for bound, count in self.cumulative()
+            },
+        }
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs: str = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+class MetricsWriter:
+    """
+    Class which renders metrics in the Prometheus text exposition format
+    """
+
+    def __init__(self) -> None:
+        self._lines: list[str] = []
+
+    def _header(self, name: str, kind: str, description: str) -> None:
+        self._lines.append(f"# HELP {name} {description}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+    def add(
+            self,
+            name: str,
+            kind: str,
+            description: str,
+            samples: Iterable[tuple[dict[str, str], float]]
+    ) -> None:
+        """
+        Add a counter or a gauge with a sample per label set
+
+        :param name: str
+        :param kind: str - "counter" or "gauge"
+        :param description: str
+        :param samples: Iterable - (labels, value)
+        :return: None
+        """
+
+        self._header(name, kind, description)
+        for labels, value in samples:
+            self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def add_histogram(
+            self,
+            name: str,
+            description: str,
+            samples: Iterable[tuple[dict[str, str], Histogram]]
+    ) -> None:
+        """
+        Add a histogram with its buckets, sum and count per label set
+
+        :param name: str
+        :param description: str
+        :param samples: Iterable - (labels, Histogram)
+        :return: None
+        """
+
+        self._header(name, "histogram", description)
+        for labels, histogram in samples:
+            for bound, count in histogram.cumulative():
+                bucket_labels: str = _format_labels({**labels, "le": _format_value(bound)})
+                self._lines.append(f"{name}_bucket{bucket_labels} {count}")
+            self._lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+            self._lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
@@ -0,0 +1,158 @@
+from sqlalchemy.pool import QueuePool
+
+from app.auth.hashing import password_hasher
+from app.auth.token_cache import token_cache
+from app.auth.user_cache import user_cache
+from app.backend.db import async_engine, async_read_engine
+from app.backend.instrumentation import request_metrics
+from app.backend.loop_monitor import loop_monitor, loop_watchdog
+from app.backend.metrics import MetricsWriter
+from app.backend.read_routing import primary_stickiness
+
+
+def _write_request_metrics(writer: MetricsWriter) -> None:
+    routes = [
+        ({"method": method, "route": route}, route_stats)
+        for (method, route), route_stats in sorted(request_metrics.routes.items())
+    ]
+    writer.add(
+        "http_requests_total", "counter", "Handled requests",
+        ((labels, route_stats.requests) for labels, route_stats in routes)
+    )
+    writer.add_histogram(
+        "http_request_duration_seconds", "Wall time of a request",
+        ((labels, route_stats.duration) for labels, route_stats in routes)
+    )
+    writer.add_histogram(
+        "http_request_db_duration_seconds", "Time a request spent in DB queries",
+        ((labels, route_stats.db_duration) for labels, route_stats in routes)
+    )
+    writer.add(
+        "http_request_db_queries_total", "counter", "DB queries issued by requests",
+        ((labels, route_stats.queries) for labels, route_stats in routes)
+    )
+    writer.add(
+        "http_request_db_rows_total", "counter", "DB rows returned or affected by requests",
+        ((labels, route_stats.rows) for labels, route_stats in routes)
+    )
+    writer.add(
+        "http_request_n_plus_one_total", "counter",
+        "Requests which issued more queries than the N+1 threshold",
+        ((labels, route_stats.n_plus_one) for labels, route_stats in routes)
+    )
+    writer.add(
+        "http_requests_in_flight", "gauge", "Requests being handled now",
+        (
+            ({"route": route}, amount)
+            for route, amount in sorted(request_metrics.in_flight_by_route().items())
+        )
+    )
+
+
+def _write_pool_metrics(writer: MetricsWriter) -> None:
+    engines = {"primary": async_engine}
+    if async_read_engine is not async_engine:
+        engines["read"] = async_read_engine
+    pools = [
+        ({"engine": name}, engine.pool) for name, engine in engines.items()
+        if isinstance(engine.pool, QueuePool)
+    ]
+    writer.add(
+        "db_pool_size", "gauge", "Persistent connections of the pool",
+        [(labels, pool.size()) for labels, pool in pools]
+    )
+    writer.add(
+        "db_pool_checked_out", "gauge", "Connections in use",
+        [(labels, pool.checkedout()) for labels, pool in pools]
+    )
+    writer.add(
+        "db_pool_checked_in", "gauge", "Idle connections in the pool",
+        [(labels, pool.checkedin()) for labels, pool in pools]
+    )
+    writer.add(
+        "db_pool_overflow", "gauge", "Connections opened over pool_size",
+        [(labels, max(pool.overflow(), 0)) for labels, pool in pools]
+    )
+    if async_read_engine is not async_engine:
+        writer.add(
+            "db_read_sessions_total", "counter",
+            "Sessions of read routes by the engine they have been routed to",
+            [
+                ({"engine": "primary"}, primary_stickiness.primary_reads),
+                ({"engine": "read"}, primary_stickiness.replica_reads),
+            ]
+        )
+
+
+def _write_event_loop_metrics(writer: MetricsWriter) -> None:
+    writer.add(
+        "event_loop_lag_last_seconds", "gauge", "The last measured event loop lag",
+        [({}, loop_monitor.last_lag)]
+    )
+    writer.add(
+        "event_loop_lag_max_seconds", "gauge", "The highest measured event loop lag",
+        [({}, loop_monitor.max_lag)]
+    )
+    writer.add_histogram(
+        "event_loop_lag_seconds", "Event loop lag", [({}, loop_monitor.lag)]
+    )
+    writer.add(
+        "event_loop_stalls_total", "counter",
+        "Times the loop was blocked longer than the watchdog threshold",
+        (({"route": route}, amount) for route, amount in sorted(loop_watchdog.route_stalls.items()))
+    )
+    writer.add(
+        "event_loop_stall_max_seconds", "gauge",
+        "The longest block of the loop seen by the watchdog",
+        [({}, loop_watchdog.max_stall)]
+    )
+
+
+def _write_auth_metrics(writer: MetricsWriter) -> None:
+    writer.add(
+        "password_hash_queue_depth", "gauge", "bcrypt jobs waiting for a free worker",
+        [({}, password_hasher.queue_depth)]
+    )
+    writer.add(
+        "password_hash_in_flight", "gauge", "bcrypt jobs running or waiting",
+        [({}, password_hasher.in_flight)]
+    )
+    writer.add(
+        "password_hash_jobs_total", "counter", "Completed bcrypt jobs",
+        [({}, password_hasher.completed)]
+    )
+    writer.add(
+        "password_hash_rejected_total", "counter", "bcrypt jobs rejected with 503",
+        [({}, password_hasher.rejected)]
+    )
+    writer.add(
+        "password_hash_seconds_total", "counter", "Time spent by bcrypt jobs",
+        [({}, password_hasher.total_seconds)]
+    )
+    writer.add(
+        "token_cache_requests_total", "counter", "Lookups of verified JWT tokens",
+        [({"result": "hit"}, token_cache.hits), ({"result": "miss"}, token_cache.misses)]
+    )
+    writer.add(
+        "user_cache_requests_total", "counter", "Lookups of shown users",
+        [({"result": "hit"}, user_cache.hits), ({"result": "miss"}, user_cache.misses)]
+    )
+    writer.add(
+        "user_cache_hit_ratio", "gauge", "Share of user lookups served from the cache",
+        [({}, user_cache.hit_ratio)]
+    )
+
+
+def collect_metrics() -> str:
+    """
+    Return the process metrics in the Prometheus text exposition format
+
+    :return: str
+    """
+
+    writer = MetricsWriter()
+    _write_request_metrics(writer)
+    _write_pool_metrics(writer)
+    _write_event_loop_metrics(writer)
+    _write_auth_metrics(writer)
+    return writer.render()
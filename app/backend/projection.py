@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Column, Row
+
+from app.backend.db import Base
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache
+def schema_columns(
+        model: type[Base], schema: type[BaseModel], *extra_fields: str
+) -> tuple[Column, ...]:
+    """
+    Return the model's table columns which a schema has fields for,
+    so a select() loads only what the response needs
+    instead of full ORM objects
+
+    :param model: type[Base]
+    :param schema: type[BaseModel]
+    :param extra_fields: str - additional columns which are needed for checks
+    :return: tuple - table columns
+    """
+
+    columns = model.__table__.c
+    return tuple(
+        columns[name]
+        for name in (*schema.model_fields, *extra_fields)
+        if name in columns
+    )
+
+
+def row_to_schema(row: Row, schema: type[ModelT], **extra_data) -> ModelT:
+    """
+    Validate a projected row straight into a schema
+
+    :param row: Row
+    :param schema: type[BaseModel]
+    :param extra_data: values of the schema's fields which aren't columns
+    :return: BaseModel - an instance of the schema
+    """
+
+    return schema.model_validate({**row._mapping, **extra_data})
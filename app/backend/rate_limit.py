@@ -0,0 +1,139 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from fastapi.responses import ORJSONResponse
+from starlette import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+RATE_LIMIT_PERIODS: dict[str, int] = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimit(NamedTuple):
+    capacity: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """
+        Return a rate limit from a "<amount>/<second|minute|hour|day>" string
+
+        :param value: str - e.g. "5/minute"
+        :return: RateLimit
+        """
+
+        amount, period = value.split("/")
+        return cls(capacity=int(amount), period=float(RATE_LIMIT_PERIODS[period.strip()]))
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+
+class RateLimitStorage(ABC):
+    """
+    Storage of token buckets.
+    Only in-process storage exists now, a shared one (e.g. Redis)
+    has to implement the same consume() method
+    """
+
+    @abstractmethod
+    async def consume(self, key: str, limit: RateLimit) -> float:
+        """
+        Take one token from a bucket
+
+        :param key: str - a bucket key
+        :param limit: RateLimit
+        :return: float - 0 if the token was taken or seconds to wait for the next one
+        """
+
+
+class InMemoryRateLimitStorage(RateLimitStorage):
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys: int = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(self, key: str, limit: RateLimit) -> float:
+        now: float = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (float(limit.capacity), now))
+        tokens = min(float(limit.capacity), tokens + (now - updated_at) * limit.refill_rate)
+        retry_after: float = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.refill_rate
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware which limits requests with token buckets
+    per route prefix and per client: a user id from the bearer token
+    or the client's IP for anonymous requests
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            limits: dict[str, str],
+            storage: RateLimitStorage,
+            identify: Callable[[str], str | None] | None = None
+    ) -> None:
+        self.app: ASGIApp = app
+        self.storage: RateLimitStorage = storage
+        self.identify: Callable[[str], str | None] | None = identify
+        self.default_limit: RateLimit | None = (
+            RateLimit.parse(limits["default"]) if "default" in limits else None
+        )
+        self.limits: list[tuple[str, RateLimit]] = sorted(
+            (
+                (prefix, RateLimit.parse(value))
+                for prefix, value in limits.items() if prefix != "default"
+            ),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+
+    def _get_limit(self, path: str) -> tuple[str, RateLimit | None]:
+        for prefix, limit in self.limits:
+            base: str = prefix.rstrip("/")
+            if path == base or path.startswith(base + "/"):
+                return prefix, limit
+        return "default", self.default_limit
+
+    def _get_client_key(self, scope: Scope) -> str:
+        if self.identify is not None:
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    if scheme.lower() == "bearer" and token:
+                        user_id: str | None = self.identify(token)
+                        if user_id is not None:
+                            return f"user:{user_id}"
+                    break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        prefix, limit = self._get_limit(scope["path"])
+        if limit is not None:
+            retry_after: float = await self.storage.consume(
+                f"{prefix}|{self._get_client_key(scope)}", limit
+            )
+            if retry_after > 0:
+                response = ORJSONResponse(
+                    {"detail": "Too many requests"},
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": str(math.ceil(retry_after))}
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
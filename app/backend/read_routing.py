@@ -0,0 +1,134 @@
+import hashlib
+import hmac
+import math
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.backend.config import settings
+
+SAFE_METHODS: frozenset[str] = frozenset(("GET", "HEAD", "OPTIONS"))
+
+READ_PRIMARY_COOKIE: str = "read_primary_until"
+READ_PRIMARY_HEADER: str = "X-Read-Primary-Until"
+
+
+class PrimaryStickiness:
+    """
+    Class which sends reads of clients that have just written to the primary
+    until the window passes so they see their own writes despite a replication lag.
+    A write response carries a signed deadline in a cookie and a header,
+    the client sends it back in the cookie or the header,
+    so every worker routes the client's reads without a shared state
+    """
+
+    def __init__(self, window: float, secret_key: str) -> None:
+        self.window: float = window
+        self._secret_key: bytes = secret_key.encode()
+        self.primary_reads: int = 0
+        self.replica_reads: int = 0
+
+    def _sign(self, deadline: str) -> str:
+        return hmac.new(self._secret_key, deadline.encode(), hashlib.sha256).hexdigest()
+
+    def issue(self) -> str:
+        """
+        Return a signed deadline of the window starting now
+
+        :return: str - "<unix time>.<signature>"
+        """
+
+        deadline: str = f"{time.time() + self.window:.3f}"
+        return f"{deadline}.{self._sign(deadline)}"
+
+    def get_deadline(self, value: str) -> float | None:
+        """
+        Return the deadline of a signed value or None if it is forged
+
+        :param value: str
+        :return: float | None
+        """
+
+        deadline, _, signature = value.rpartition(".")
+        if not deadline or not hmac.compare_digest(signature, self._sign(deadline)):
+            return None
+        try:
+            return float(deadline)
+        except ValueError:
+            return None
+
+    def mark_write(self, request: Request) -> None:
+        """
+        Remember that the request has written,
+        PrimaryStickinessMiddleware sends the deadline to the client
+
+        :param request: Request
+        :return: None
+        """
+
+        if self.window > 0:
+            request.state.read_primary_until = self.issue()
+
+    def reads_from_primary(self, request: Request) -> bool:
+        """
+        Return whether the request carries a deadline which hasn't passed
+
+        :param request: Request
+        :return: bool
+        """
+
+        value: str | None = (
+            request.headers.get(READ_PRIMARY_HEADER) or request.cookies.get(READ_PRIMARY_COOKIE)
+        )
+        deadline: float | None = self.get_deadline(value) if value else None
+        if deadline is None or deadline <= time.time():
+            self.replica_reads += 1
+            return False
+        self.primary_reads += 1
+        return True
+
+    def metrics(self) -> dict:
+        return {
+            "window": self.window,
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+        }
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Middleware which adds the deadline of a request that has written
+    to a successful response as a cookie and a header
+    """
+
+    def __init__(self, app: ASGIApp, stickiness: PrimaryStickiness) -> None:
+        self.app: ASGIApp = app
+        self.stickiness: PrimaryStickiness = stickiness
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # request.state of the routes is kept in the same dict
+        state: dict = scope.setdefault("state", {})
+
+        async def send_with_deadline(message: Message) -> None:
+            value: str | None = state.get("read_primary_until")
+            if message["type"] == "http.response.start" and value is not None and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={value}; Max-Age={math.ceil(self.stickiness.window)}; "
+                    "Path=/; HttpOnly; SameSite=lax"
+                )
+                headers[READ_PRIMARY_HEADER] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_deadline)
+
+
+primary_stickiness = PrimaryStickiness(
+    window=settings.DB_READ_STICKY_SECONDS, secret_key=settings.SECRET_KEY
+)
@@ -0,0 +1,29 @@
+from typing import Any, Generic, TypeVar
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+DataT = TypeVar("DataT")
+
+
+class ResponseSchema(BaseModel, Generic[DataT]):
+    data: DataT | None = None
+    status_code: int
+    detail: str
+
+
+class PageResponseSchema(ResponseSchema[DataT], Generic[DataT]):
+    next_cursor: str | None = None
+
+
+class SchemaResponse(ORJSONResponse):
+    """
+    Response class which serializes a pydantic model
+    straight to json bytes with pydantic-core
+    and any other content with orjson
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
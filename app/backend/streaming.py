@@ -0,0 +1,57 @@
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from starlette import status
+
+MAX_LINE_LENGTH: int = 1 << 20
+
+
+def _decode_line(line: bytes, line_number: int) -> str:
+    try:
+        return line.decode().rstrip("\r")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Line {line_number} isn't valid UTF-8"
+        )
+
+
+def _line_too_long(line_number: int, max_line_length: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Line {line_number} is longer than {max_line_length} bytes"
+    )
+
+
+async def iter_lines(
+        chunks: AsyncIterator[bytes], max_line_length: int = MAX_LINE_LENGTH
+) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 byte chunks into text lines
+    keeping only one unfinished line of at most max_line_length bytes in memory
+    or get an Exception with the number of a line which is too long or isn't UTF-8
+
+    :param chunks: AsyncIterator[bytes]
+    :param max_line_length: int - bytes of a line without the line break
+    :return: AsyncIterator[str]
+    """
+
+    rest: bytearray = bytearray()
+    line_number: int = 0
+    async for chunk in chunks:
+        # only the new chunk is scanned, the unfinished line is never split again
+        *lines, tail = chunk.split(b"\n")
+        if lines:
+            lines[0] = bytes(rest) + lines[0]
+            rest = bytearray(tail)
+        else:
+            rest += tail
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_length:
+                raise _line_too_long(line_number, max_line_length)
+            yield _decode_line(line, line_number)
+        if len(rest) > max_line_length:
+            raise _line_too_long(line_number + 1, max_line_length)
+    if rest:
+        yield _decode_line(bytes(rest), line_number + 1)
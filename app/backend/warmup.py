@@ -0,0 +1,126 @@
+import asyncio
+import contextlib
+import logging
+import time
+from uuid import UUID
+
+from sqlalchemy import Executable, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.auth.hashing import password_hasher
+from app.auth.model import User
+from app.auth.schema import ShowUser
+from app.backend.projection import schema_columns
+from app.todo.folder.model import Folder
+from app.todo.folder.schema import ShowFolder
+
+logger = logging.getLogger(__name__)
+
+WARMUP_UUID: UUID = UUID(int=0)
+
+
+def _hot_queries() -> list[Executable]:
+    """
+    Return the statements of the hottest routes built the same way
+    as the services build them, so their compiled SQL is cached by SQLAlchemy
+    and prepared by asyncpg before the first request
+
+    :return: list - statements which don't match any row
+    """
+
+    return [
+        # login
+        select(User).where(User.username == ""),
+        # show user by username and by id
+        select(*schema_columns(User, ShowUser)).where(User.username == ""),
+        select(*schema_columns(User, ShowUser)).where(User.id == WARMUP_UUID),
+        # show folder
+        select(*schema_columns(Folder, ShowFolder, "is_private")).filter_by(id=WARMUP_UUID),
+        # list folders
+        select(*schema_columns(Folder, ShowFolder, "created_at"))
+        .filter_by(user_id=WARMUP_UUID)
+        .order_by(Folder.created_at, Folder.id)
+        .limit(1),
+    ]
+
+
+async def _prime_connection(connection: AsyncConnection) -> None:
+    for statement in _hot_queries():
+        await connection.execute(statement)
+
+
+def get_warmup_connections(pool: Pool, connections: int) -> int:
+    """
+    Return the amount of connections to open at once clamped to the pool capacity,
+    more of them would wait for the pool timeout
+
+    :param pool: Pool
+    :param connections: int - requested amount
+    :return: int
+    """
+
+    if isinstance(pool, QueuePool) and pool._max_overflow >= 0:
+        return min(connections, pool.size() + pool._max_overflow)
+    return connections
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Open connections of a pool at once and prepare the hot queries on each of them,
+    the connections stay in the pool after that
+
+    :param engine: AsyncEngine
+    :param connections: int - amount of the connections to open, at most the pool capacity
+    :return: int - amount of the connections which have been warmed up
+    """
+
+    connections = get_warmup_connections(engine.pool, connections)
+    if connections <= 0:
+        return 0
+    async with contextlib.AsyncExitStack() as stack:
+        opened = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+            return_exceptions=True
+        )
+        ready: list[AsyncConnection] = [
+            connection for connection in opened if isinstance(connection, AsyncConnection)
+        ]
+        primed = await asyncio.gather(
+            *(_prime_connection(connection) for connection in ready),
+            return_exceptions=True
+        )
+    errors: list[BaseException] = [
+        result for result in (*opened, *primed) if isinstance(result, BaseException)
+    ]
+    if errors:
+        logger.warning("DB pool warm-up failed on %d connections: %r", len(errors), errors[0])
+    return len(ready) - sum(isinstance(result, BaseException) for result in primed)
+
+
+async def warm_up_password_hasher() -> None:
+    """
+    Load the bcrypt backend and start a hashing thread
+    so the first login doesn't pay for it
+    """
+
+    await password_hasher.hash("warm-up-password")
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    """
+    Warm up the DB pool and the password hasher concurrently
+
+    :param engine: AsyncEngine
+    :param connections: int - amount of the pool connections to open
+    :return: None
+    """
+
+    started_at: float = time.perf_counter()
+    warmed, _ = await asyncio.gather(
+        warm_up_pool(engine, connections), warm_up_password_hasher()
+    )
+    logger.info(
+        "Warmed up %d/%d DB connections and the password hasher in %.3fs",
+        warmed, connections, time.perf_counter() - started_at
+    )
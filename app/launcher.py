@@ -0,0 +1,140 @@
+import argparse
+import importlib.util
+import logging
+import os
+
+import uvicorn
+from sqlalchemy.engine import make_url
+
+from app.backend.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+APP_IMPORT_STRING: str = "app.main:app"
+
+
+def _resolve_implementation(choice: str, preferred: str, fallback: str) -> str:
+    if choice != "auto":
+        return choice
+    return preferred if importlib.util.find_spec(preferred) is not None else fallback
+
+
+def get_worker_pool_size(
+        pool_size: int,
+        max_overflow: int,
+        workers: int,
+        max_connections: int,
+        reserved: int,
+        engines: int = 1
+) -> tuple[int, int]:
+    """
+    Return pool_size and max_overflow of one engine's pool in a worker
+    so the pools of all workers fit in Postgres max_connections
+
+    :param pool_size: int - configured pool_size
+    :param max_overflow: int - configured max_overflow
+    :param workers: int
+    :param max_connections: int - Postgres max_connections
+    :param reserved: int - connections left for other clients
+    :param engines: int - engines of a worker connected to the server
+    :return: tuple - (pool_size, max_overflow)
+    """
+
+    per_worker: int = (max_connections - reserved) // (workers * engines)
+    if per_worker < 1:
+        raise SystemExit(
+            f"{workers} workers ({engines} pools each) don't fit in {max_connections} DB connections "
+            f"with {reserved} reserved ones"
+        )
+    worker_pool_size: int = min(pool_size, per_worker)
+    return worker_pool_size, min(max_overflow, per_worker - worker_pool_size)
+
+
+def _read_engine_on_primary(config: Settings) -> bool:
+    if config.SQL_READ_PATH is None:
+        return False
+    primary, read = make_url(config.DATABASE_URL_async), make_url(config.DATABASE_URL_read_async)
+    return (primary.host, primary.port) == (read.host, read.port)
+
+
+def configure_worker_pools(config: Settings, workers: int) -> None:
+    """
+    Shrink the DB pool of each worker to DB_MAX_CONNECTIONS divided by workers.
+    A read engine on the primary's server halves the share of each pool,
+    a replica's pools get the same size from its own max_connections.
+    The values are put into the environment which worker processes inherit
+    and into the settings of the current process
+
+    :param config: Settings
+    :param workers: int
+    :return: None
+    """
+
+    if config.DB_MAX_CONNECTIONS is None:
+        return
+    options: dict = config.db_engine_options
+    engines: int = 2 if _read_engine_on_primary(config) else 1
+    pool_size, max_overflow = get_worker_pool_size(
+        pool_size=options["pool_size"],
+        max_overflow=options["max_overflow"],
+        workers=workers,
+        max_connections=config.DB_MAX_CONNECTIONS,
+        reserved=config.DB_RESERVED_CONNECTIONS,
+        engines=engines
+    )
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    config.DB_POOL_SIZE = pool_size
+    config.DB_MAX_OVERFLOW = max_overflow
+    logger.info(
+        "DB pool per worker: pool_size=%d, max_overflow=%d (%d workers, %d pools each, max_connections=%d)",
+        pool_size, max_overflow, workers, engines, config.DB_MAX_CONNECTIONS
+    )
+
+
+def get_uvicorn_options(config: Settings) -> dict:
+    """
+    Return uvicorn.run() options from the SERVER_* settings.
+    Reload runs a single worker
+
+    :param config: Settings
+    :return: dict
+    """
+
+    workers: int = 1 if config.SERVER_RELOAD else (config.SERVER_WORKERS or os.cpu_count() or 1)
+    return {
+        "host": config.SERVER_HOST,
+        "port": config.SERVER_PORT,
+        "workers": workers,
+        "loop": _resolve_implementation(config.SERVER_LOOP, "uvloop", "asyncio"),
+        "http": _resolve_implementation(config.SERVER_HTTP, "httptools", "h11"),
+        "reload": config.SERVER_RELOAD,
+        "timeout_keep_alive": config.SERVER_KEEPALIVE,
+        "backlog": config.SERVER_BACKLOG,
+        "timeout_graceful_shutdown": config.SERVER_GRACEFUL_SHUTDOWN,
+    }
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the todo app with uvicorn")
+    parser.add_argument("--host", help="SERVER_HOST")
+    parser.add_argument("--port", type=int, help="SERVER_PORT")
+    parser.add_argument("--workers", type=int, help="SERVER_WORKERS, CPU cores by default")
+    parser.add_argument("--reload", action="store_true", default=None, help="SERVER_RELOAD")
+    parsed = parser.parse_args(args)
+    logging.basicConfig(level=logging.INFO)
+    for name, value in vars(parsed).items():
+        if value is not None:
+            setattr(settings, f"SERVER_{name.upper()}", value)
+
+    options: dict = get_uvicorn_options(settings)
+    configure_worker_pools(settings, options["workers"])
+    logger.info(
+        "Starting %d workers on %s:%d with %s loop and %s http",
+        options["workers"], options["host"], options["port"], options["loop"], options["http"]
+    )
+    uvicorn.run(APP_IMPORT_STRING, **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,46 @@
-import uvicorn
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Annotated
+
+from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from app.auth import user_router, auth_router
-from app.backend.config import ROOT_API
+from app.auth.hashing import password_hasher
+from app.backend.config import ROOT_API, settings
+from app.backend.db import async_engine, async_read_engine
+from app.backend.instrumentation import (
+    RequestInstrumentationMiddleware, install_query_hooks, request_metrics
+)
+from app.backend.loop_monitor import loop_monitor, loop_watchdog
+from app.backend.metrics import PROMETHEUS_CONTENT_TYPE
+from app.backend.monitoring import collect_metrics
+from app.backend.rate_limit import RateLimitMiddleware, InMemoryRateLimitStorage
+from app.backend.read_routing import PrimaryStickinessMiddleware, primary_stickiness
+from app.backend.warmup import warm_up, warm_up_pool
 from app.todo.folder import router as folder_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop_monitor.start()
+    if settings.EVENT_LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start(routes=app.routes)
+    await warm_up(async_engine, connections=settings.db_warmup_connections)
+    if async_read_engine is not async_engine:
+        await warm_up_pool(async_read_engine, connections=settings.db_warmup_connections)
+    yield
+    await loop_watchdog.stop()
+    await loop_monitor.stop()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+    password_hasher.shutdown()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 app_v1 = FastAPI(
-    redirect_slashes=False
+    redirect_slashes=False,
+    default_response_class=ORJSONResponse
 )
 
 
@@ -18,9 +51,59 @@ async def welcome() -> dict:
     return {"message": "My todo app"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """
+    Return request, connection pool, event loop and bcrypt metrics
+    in the Prometheus text exposition format
+    """
+    return PlainTextResponse(collect_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get(ROOT_API + "/metrics/requests")
+async def show_request_metrics(
+        get_user: Annotated[dict, Depends(auth_router.get_current_user)]
+) -> list[dict]:
+    """
+    Return per route request statistics: wall time, DB time,
+    queries and rows per request and the amount of possible N+1 requests
+
+    :param get_user: dict - only an admin can see the metrics
+    :return: list - statistics of each (method, route template)
+    """
+    if not get_user["is_superuser"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have admin permission"
+        )
+    return request_metrics.snapshot()
+
+
 app.include_router(user_router.router)
 app.include_router(auth_router.router)
 app.include_router(folder_router.router)
 
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits=settings.RATE_LIMITS,
+        storage=InMemoryRateLimitStorage(),
+        identify=auth_router.get_token_user_id
+    )
+
+app.add_middleware(PrimaryStickinessMiddleware, stickiness=primary_stickiness)
+
+if settings.REQUEST_METRICS_ENABLED:
+    install_query_hooks(async_engine.sync_engine)
+    if async_read_engine is not async_engine:
+        install_query_hooks(async_read_engine.sync_engine)
+    app.add_middleware(
+        RequestInstrumentationMiddleware,
+        metrics=request_metrics,
+        n_plus_one_threshold=settings.N_PLUS_ONE_QUERY_THRESHOLD
+    )
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8888)
\ No newline at end of file
+    from app.launcher import main
+
+    main()
\ No newline at end of file
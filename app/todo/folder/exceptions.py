@@ -1,8 +1,10 @@
+from typing import NamedTuple
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, exists, false, null
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from starlette import status
 
 from app.auth.exceptions import user_have_no_admin_permissions
@@ -10,33 +12,42 @@ from app.todo.folder.model import Folder
 from app.todo.folder.schema import CreateFolder, UpdateFolder
 
 
-async def _is_name_taken_by_user_id(user_id: UUID, folder_name: str, db: AsyncSession) -> bool:
+class FolderChecks(NamedTuple):
+    is_name_taken: bool
+    parent_user_id: UUID | None
+    parent_path: str | None
+
+
+async def _get_folder_checks(
+        db: AsyncSession,
+        user_id: UUID | str,
+        folder_name: str | None,
+        parent_id: UUID | None
+) -> FolderChecks:
     """
-    Bool value of existing a folder's name with some folder's user id in it
+    Return everything needed to validate a created or updated folder
+    with one query: whether the user already has a folder with the name,
+    and the owner and materialized path of the parent folder
 
-    :param user_id: UUID
-    :param folder_name: str
     :param db: AsyncSession
-    :return: bool
+    :param user_id: UUID | str
+    :param folder_name: str | None - None skips the name check
+    :param parent_id: UUID | None - None skips the parent check
+    :return: FolderChecks - (is_name_taken, parent_user_id, parent_path)
     """
 
-    return bool(
-        await db.scalar(select(Folder).filter(
+    is_name_taken = false()
+    if folder_name is not None:
+        is_name_taken = exists().where(
             and_(Folder.name == folder_name, Folder.user_id == user_id)
-            ))
-    )
-
-
-async def _is_users_parent_folder(
-        user_id: UUID | str, parent_id: UUID, db: AsyncSession
-) -> bool:
-    parent_folder: Folder | None = await db.scalar(select(Folder).filter_by(id=parent_id))
-    if not parent_folder:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Given parent_id folder doesn't exist"
         )
-    return parent_folder.user_id == user_id or str(parent_folder.user_id) == user_id
+    parent_user_id = parent_path = null()
+    if parent_id is not None:
+        parent: type[Folder] = aliased(Folder)
+        parent_user_id = select(parent.user_id).filter(parent.id == parent_id).scalar_subquery()
+        parent_path = select(parent.path).filter(parent.id == parent_id).scalar_subquery()
+    row = (await db.execute(select(is_name_taken, parent_user_id, parent_path))).one()
+    return FolderChecks(*row)
 
 
 def folder_not_exist(folder: Folder | None) -> None:
@@ -47,16 +58,11 @@ def folder_not_exist(folder: Folder | None) -> None:
         )
 
 
-async def name_is_taken_by_user(
-        db: AsyncSession,
-        folder_data: CreateFolder | UpdateFolder,
-        get_user: dict,
+def name_is_taken_by_user(
+        checks: FolderChecks,
         action_name: str = "create"
-):
-    is_name_taken_by_user: bool = await _is_name_taken_by_user_id(
-        db=db, folder_name=folder_data.name, user_id=get_user["id"]
-    )
-    if is_name_taken_by_user:
+) -> None:
+    if checks.is_name_taken:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"You can't {action_name} a folder "
@@ -64,17 +70,19 @@ async def name_is_taken_by_user(
         )
 
 
-async def other_user_parent_folder(
-        db: AsyncSession,
+def other_user_parent_folder(
+        checks: FolderChecks,
         get_user: dict,
         folder_data: CreateFolder | UpdateFolder,
         action_name: str = "create"
 ) -> None:
     if folder_data.parent_id:
-        is_users_parent_folder: bool = await _is_users_parent_folder(
-            db=db, user_id=get_user["id"], parent_id=folder_data.parent_id
-        )
-        if not is_users_parent_folder:
+        if checks.parent_user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Given parent_id folder doesn't exist"
+            )
+        if str(checks.parent_user_id) != str(get_user["id"]):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"You can't {action_name} a nested folder "
@@ -82,12 +90,41 @@ async def other_user_parent_folder(
             )
 
 
-def private_folder(folder: Folder, get_user: dict) -> None:
-    if (
+def folder_moved_inside_itself(folder: Folder, parent_path: str | None) -> None:
+    if parent_path and parent_path.startswith(folder.path):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can't move a folder inside of itself"
+        )
+
+
+def import_has_too_many_lines(total: int, max_lines: int) -> None:
+    if total >= max_lines:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"You can't import more than {max_lines} folders at once"
+        )
+
+
+def import_has_too_many_waiting(waiting: int, max_waiting: int) -> None:
+    if waiting > max_waiting:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"More than {max_waiting} folders wait for parents given later in the file, "
+                   "put parents before their children"
+        )
+
+
+def _is_hidden_private_folder(folder: Folder, get_user: dict) -> bool:
+    return (
             not get_user["is_superuser"]
             and folder.is_private
             and str(folder.user_id) != get_user["id"]
-    ):
+    )
+
+
+def private_folder(folder: Folder, get_user: dict) -> None:
+    if _is_hidden_private_folder(folder=folder, get_user=get_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can't see a private folder of other user"
@@ -104,13 +141,27 @@ class FolderExceptionManager:
             db: AsyncSession,
             get_user: dict,
             folder_data: CreateFolder | UpdateFolder
-    ) -> None:
-        await name_is_taken_by_user(
-            db=db, folder_data=folder_data, get_user=get_user
+    ) -> str | None:
+        """
+        Validate a new folder with one query or get an Exception
+
+        :param db: AsyncSession
+        :param get_user: dict
+        :param folder_data: CreateFolder
+        :return: str | None - materialized path of the parent folder
+        """
+
+        checks: FolderChecks = await _get_folder_checks(
+            db=db,
+            user_id=get_user["id"],
+            folder_name=folder_data.name,
+            parent_id=folder_data.parent_id
         )
-        await other_user_parent_folder(
-            db=db, folder_data=folder_data, get_user=get_user
+        name_is_taken_by_user(checks=checks)
+        other_user_parent_folder(
+            checks=checks, folder_data=folder_data, get_user=get_user
         )
+        return checks.parent_path
 
 
     @staticmethod
@@ -132,13 +183,21 @@ class FolderExceptionManager:
         user_have_no_admin_permissions(
             get_user=get_user, user_id=str(folder.user_id)
         )
-        if updated_data.name and updated_data.name != folder.name:
-            await name_is_taken_by_user(
-                folder_data=updated_data, db=db, get_user=get_user, action_name="update"
-            )
-        await other_user_parent_folder(
-            db=db, folder_data=updated_data, get_user=get_user, action_name="update"
+        is_name_changed: bool = bool(updated_data.name) and updated_data.name != folder.name
+        if not is_name_changed and not updated_data.parent_id:
+            return
+        checks: FolderChecks = await _get_folder_checks(
+            db=db,
+            user_id=get_user["id"],
+            folder_name=updated_data.name if is_name_changed else None,
+            parent_id=updated_data.parent_id
+        )
+        name_is_taken_by_user(checks=checks, action_name="update")
+        other_user_parent_folder(
+            checks=checks, folder_data=updated_data, get_user=get_user, action_name="update"
         )
+        if updated_data.parent_id != folder.parent_id:
+            folder_moved_inside_itself(folder=folder, parent_path=checks.parent_path)
 
 
     @staticmethod
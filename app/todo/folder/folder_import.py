@@ -0,0 +1,288 @@
+import logging
+from collections import defaultdict
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+import orjson
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.todo.folder.exceptions import (
+    FolderChecks,
+    import_has_too_many_lines,
+    import_has_too_many_waiting,
+    name_is_taken_by_user,
+    other_user_parent_folder,
+)
+from app.todo.folder.model import Folder
+from app.todo.folder.schema import (
+    FolderImportError,
+    FoldersImportReport,
+    ImportFolder,
+    FOLDERS_IMPORT_CHUNK_SIZE,
+    FOLDERS_IMPORT_MAX_LINES,
+    FOLDERS_IMPORT_MAX_WAITING,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FolderImporter:
+    """
+    Class which creates folders of NDJSON lines in one transaction.
+    Lines are validated by chunks with two queries per chunk
+    (taken names and existing parents), a folder waits in memory
+    until the line of its parent_ref has been created,
+    so folders are inserted in topological order by bulk INSERTs.
+    Refs, names, ids and paths of created folders, failed refs, errors
+    and the waiting lines are kept between chunks, so memory grows with the refs
+    of the file: up to max_lines lines are read and up to max_waiting lines wait,
+    a larger file is rejected
+    """
+
+    def __init__(
+            self,
+            db: AsyncSession,
+            get_user: dict,
+            chunk_size: int = FOLDERS_IMPORT_CHUNK_SIZE,
+            max_lines: int = FOLDERS_IMPORT_MAX_LINES,
+            max_waiting: int = FOLDERS_IMPORT_MAX_WAITING
+    ) -> None:
+        self.db: AsyncSession = db
+        self.get_user: dict = get_user
+        self.user_id: UUID = UUID(str(get_user["id"]))
+        self.chunk_size: int = chunk_size
+        self.max_lines: int = max_lines
+        self.max_waiting: int = max_waiting
+        self.refs: set[str] = set()
+        self.created_refs: dict[str, tuple[UUID, str]] = {}
+        self.failed_refs: set[str] = set()
+        self.names: set[str] = set()
+        self.waiting: defaultdict[str, list[tuple[int, ImportFolder]]] = defaultdict(list)
+        self.waiting_count: int = 0
+        self.chunk: list[tuple[int, ImportFolder]] = []
+        self.inserts: list[dict] = []
+        self.errors: list[FolderImportError] = []
+        self.total: int = 0
+        self.created: int = 0
+
+    async def add_line(self, line: int, text: str) -> None:
+        """
+        Parse and validate a line, the line is checked
+        against the DB with the rest of its chunk
+
+        :param line: int - line number
+        :param text: str
+        :return: None
+        """
+
+        import_has_too_many_lines(total=self.total, max_lines=self.max_lines)
+        self.total += 1
+        try:
+            row = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            self.errors.append(FolderImportError(line=line, detail="Invalid JSON"))
+            return
+        try:
+            folder: ImportFolder = ImportFolder.model_validate(row)
+        except ValidationError as error:
+            ref = row.get("ref") if isinstance(row, dict) else None
+            self._fail(line, ref if isinstance(ref, str) else None, "; ".join(
+                f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+                for item in error.errors()
+            ))
+            return
+        if folder.ref in self.refs:
+            self.errors.append(FolderImportError(
+                line=line, ref=folder.ref, detail="This ref is repeated in the file"
+            ))
+            return
+        self.refs.add(folder.ref)
+        self.chunk.append((line, folder))
+        if len(self.chunk) >= self.chunk_size:
+            await self.flush_chunk()
+
+    def _fail(self, line: int, ref: str | None, detail: str) -> None:
+        """
+        Report a line and every waiting line under it as not created
+
+        :param line: int
+        :param ref: str | None
+        :param detail: str
+        :return: None
+        """
+
+        self.errors.append(FolderImportError(line=line, ref=ref, detail=detail))
+        refs: list[str] = [ref] if ref is not None else []
+        while refs:
+            parent_ref: str = refs.pop()
+            self.failed_refs.add(parent_ref)
+            children: list[tuple[int, ImportFolder]] = self.waiting.pop(parent_ref, [])
+            self.waiting_count -= len(children)
+            for child_line, child in children:
+                self.errors.append(FolderImportError(
+                    line=child_line,
+                    ref=child.ref,
+                    detail=f"Parent folder with ref {parent_ref!r} hasn't been created"
+                ))
+                refs.append(child.ref)
+
+    def _create(self, line: int, folder: ImportFolder, parent_id: UUID | None, parent_path: str | None) -> None:
+        """
+        Add a folder and every waiting line under it to the inserts,
+        a name is reserved only when its folder is created,
+        so a waiting line whose name has been taken meanwhile fails
+
+        :param line: int
+        :param folder: ImportFolder
+        :param parent_id: UUID | None
+        :param parent_path: str | None - materialized path of the parent
+        :return: None
+        """
+
+        folders: list[tuple[int, ImportFolder, UUID | None, str | None]] = [
+            (line, folder, parent_id, parent_path)
+        ]
+        while folders:
+            line, folder, parent_id, parent_path = folders.pop()
+            try:
+                name_is_taken_by_user(checks=FolderChecks(
+                    is_name_taken=folder.name in self.names, parent_user_id=None, parent_path=parent_path
+                ))
+            except HTTPException as error:
+                self._fail(line, folder.ref, error.detail)
+                continue
+            self.names.add(folder.name)
+            folder_id: UUID = uuid4()
+            path: str = Folder.build_path(parent_path, folder_id)
+            self.inserts.append({
+                "id": folder_id,
+                "name": folder.name,
+                "description": folder.description,
+                "parent_id": parent_id,
+                "user_id": self.user_id,
+                "path": path,
+            })
+            self.created_refs[folder.ref] = (folder_id, path)
+            children: list[tuple[int, ImportFolder]] = self.waiting.pop(folder.ref, [])
+            self.waiting_count -= len(children)
+            folders.extend((child_line, child, folder_id, path) for child_line, child in children)
+
+    async def flush_chunk(self) -> None:
+        """
+        Check names and existing parents of the chunk with one query each,
+        create the lines whose parents are known and insert
+        the created folders when there are enough of them
+
+        :return: None
+        """
+
+        chunk, self.chunk = self.chunk, []
+        names: set[str] = {folder.name for _, folder in chunk}
+        taken_names: set[str] = set(
+            await self.db.scalars(
+                select(Folder.name).filter(Folder.user_id == self.user_id, Folder.name.in_(names))
+            )
+        ) if names else set()
+        parent_ids: set[UUID] = {folder.parent_id for _, folder in chunk if folder.parent_id}
+        parents: dict[UUID, tuple[UUID, str]] = {
+            row.id: (row.user_id, row.path)
+            for row in await self.db.execute(
+                select(Folder.id, Folder.user_id, Folder.path).filter(Folder.id.in_(parent_ids))
+            )
+        } if parent_ids else {}
+
+        for line, folder in chunk:
+            parent_user_id, parent_path = parents.get(folder.parent_id, (None, None))
+            checks: FolderChecks = FolderChecks(
+                is_name_taken=folder.name in taken_names or folder.name in self.names,
+                parent_user_id=parent_user_id,
+                parent_path=parent_path
+            )
+            try:
+                name_is_taken_by_user(checks=checks)
+                other_user_parent_folder(checks=checks, get_user=self.get_user, folder_data=folder)
+            except HTTPException as error:
+                self._fail(line, folder.ref, error.detail)
+                continue
+            if folder.parent_ref is None:
+                self._create(line, folder, folder.parent_id, parent_path)
+            elif folder.parent_ref in self.created_refs:
+                self._create(line, folder, *self.created_refs[folder.parent_ref])
+            elif folder.parent_ref in self.failed_refs:
+                self._fail(
+                    line, folder.ref,
+                    f"Parent folder with ref {folder.parent_ref!r} hasn't been created"
+                )
+            else:
+                self.waiting_count += 1
+                import_has_too_many_waiting(waiting=self.waiting_count, max_waiting=self.max_waiting)
+                self.waiting[folder.parent_ref].append((line, folder))
+
+        if len(self.inserts) >= self.chunk_size:
+            await self.flush_inserts()
+
+    async def flush_inserts(self) -> None:
+        if not self.inserts:
+            return
+        await self.db.execute(insert(Folder), self.inserts)
+        self.created += len(self.inserts)
+        self.inserts = []
+        logger.info(
+            "Folder import of user %s: %d lines read, %d folders inserted, %d errors",
+            self.user_id, self.total, self.created, len(self.errors)
+        )
+
+    async def finish(self) -> FoldersImportReport:
+        """
+        Create the rest of the folders, report the lines whose parents
+        have never been created (missing refs or cycles) and commit
+
+        :return: FoldersImportReport - (total, created, errors)
+        """
+
+        await self.flush_chunk()
+        for parent_ref, folders in list(self.waiting.items()):
+            for line, folder in folders:
+                self.errors.append(FolderImportError(
+                    line=line,
+                    ref=folder.ref,
+                    detail=(
+                        f"Parent folder with ref {parent_ref!r} isn't in the file"
+                        if parent_ref not in self.refs
+                        else f"Parent folder with ref {parent_ref!r} is inside of this folder"
+                    )
+                ))
+        self.waiting.clear()
+        self.waiting_count = 0
+        await self.flush_inserts()
+        await self.db.commit()
+        self.errors.sort(key=lambda error: error.line)
+        return FoldersImportReport(total=self.total, created=self.created, errors=self.errors)
+
+
+async def import_folders(
+        db: AsyncSession, get_user: dict, lines: AsyncIterator[str]
+) -> FoldersImportReport:
+    """
+    Create the user's folders of NDJSON lines in one transaction
+    or get an Exception when the file is over FOLDERS_IMPORT_MAX_LINES
+    or FOLDERS_IMPORT_MAX_WAITING lines wait for their parents
+
+    :param db: AsyncSession
+    :param get_user: dict
+    :param lines: AsyncIterator[str] - one (ref, name, Optional[description, parent_ref, parent_id]) json per line
+    :return: FoldersImportReport - (total, created, errors)
+    """
+
+    importer: FolderImporter = FolderImporter(
+        db=db, get_user=get_user, max_lines=FOLDERS_IMPORT_MAX_LINES, max_waiting=FOLDERS_IMPORT_MAX_WAITING
+    )
+    line_number: int = 0
+    async for line in lines:
+        line_number += 1
+        if line.strip():
+            await importer.add_line(line_number, line)
+    return await importer.finish()
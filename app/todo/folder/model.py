@@ -1,7 +1,7 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import String, Boolean, Text, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Boolean, Text, ForeignKey, Index, select, event, Connection
+from sqlalchemy.orm import Mapped, mapped_column, Mapper
 
 from app.backend.db import Base
 from app.mixins.model_mixins.id_mixins import IDMixin
@@ -21,6 +21,40 @@ class Folder(IDMixin, TimestampsMixin, Base):
     parent_id: Mapped[UUID | None] = mapped_column(
         ForeignKey(column="folders.id", ondelete="CASCADE"), nullable=True
     )
+    # Materialized path of the folder: "/<root id hex>/.../<own id hex>/"
+    path: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (
+        Index("ix_folders_path", "path", postgresql_ops={"path": "text_pattern_ops"}),
+        Index("ix_folders_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index(
+            "ix_folders_user_id_parent_id_created_at_id",
+            "user_id", "parent_id", "created_at", "id"
+        ),
+    )
 
-
-
+    @staticmethod
+    def build_path(parent_path: str | None, folder_id: UUID) -> str:
+        """
+        Return a materialized path of a folder placed into a parent's path
+
+        :param parent_path: str | None - None for a root folder
+        :param folder_id: UUID
+        :return: str
+        """
+
+        return f"{parent_path or '/'}{folder_id.hex}/"
+
+
+@event.listens_for(Folder, "before_insert")
+def _set_folder_path(mapper: Mapper, connection: Connection, folder: Folder) -> None:
+    if folder.path is not None:
+        return
+    if folder.id is None:
+        folder.id = uuid4()
+    parent_path: str | None = None
+    if folder.parent_id is not None:
+        parent_path = connection.scalar(
+            select(Folder.path).filter_by(id=folder.parent_id)
+        )
+    folder.path = Folder.build_path(parent_path, folder.id)
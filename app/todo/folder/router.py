@@ -1,89 +1,211 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.auth.auth_router import get_current_user
 from app.backend.config import ROOT_API
-from app.backend.db_depends import get_db
-from app.todo.folder.schema import CreateFolder, UpdateFolder
+from app.backend.db_depends import get_db, get_read_db
+from app.backend.responses import ResponseSchema, PageResponseSchema, SchemaResponse
+from app.backend.streaming import iter_lines
+from app.todo.folder.schema import (
+    CreateFolder,
+    UpdateFolder,
+    ShowFolder,
+    ListFoldersParams,
+    FolderBatch,
+    FolderOperationResult,
+    FoldersImportReport,
+    FOLDER_TREE_MAX_DEPTH,
+)
 from app.todo.folder.service import FolderManager
 
 router = APIRouter(prefix=ROOT_API + "/folders", tags=["folders"])
 
-@router.post(path="/", status_code=status.HTTP_201_CREATED, response_model=dict)
+@router.post(path="/", status_code=status.HTTP_201_CREATED, response_model=ResponseSchema[ShowFolder])
 async def create_folder(
         db: Annotated[AsyncSession, Depends(get_db)],
         get_user: Annotated[dict, Depends(get_current_user)],
         new_folder: CreateFolder
-)-> dict:
+)-> SchemaResponse:
     """
     Create a folder and return a response with the folder data
 
     :param db: AsyncSession
     :param new_folder: CreateUser - (name, Optional[description, parent_id])
     :param get_user: dict - a user who requires to create the folder
-    :return: dict - (id, name, description, parent_id, user_id)
+    :return: SchemaResponse - (id, name, description, parent_id, user_id)
     """
-    folder_data: dict = await FolderManager.create_folder(db=db, get_user=get_user, folder_data=new_folder)
-    return {
-        "data": folder_data,
-        "status_code": status.HTTP_201_CREATED,
-        "detail": "Successful"
-    }
+    folder_data: ShowFolder = await FolderManager.create_folder(db=db, get_user=get_user, folder_data=new_folder)
+    return SchemaResponse(
+        ResponseSchema[ShowFolder](
+            data=folder_data,
+            status_code=status.HTTP_201_CREATED,
+            detail="Successful"
+        ),
+        status_code=status.HTTP_201_CREATED
+    )
 
 
-@router.get(path="/{folder_id}", response_model=dict)
-async def show_folder(
+@router.post(path="/batch", response_model=ResponseSchema[list[FolderOperationResult]])
+async def batch_folders(
         db: Annotated[AsyncSession, Depends(get_db)],
         get_user: Annotated[dict, Depends(get_current_user)],
+        batch: FolderBatch
+)-> SchemaResponse:
+    """
+    Apply a list of create/update/delete folder operations in one transaction
+    and return a response with a result of every operation
+
+    :param db: AsyncSession
+    :param get_user: dict - a user who requires the operations
+    :param batch: FolderBatch - (operations)
+    :return: SchemaResponse - (data: [(action, folder_id, status_code, detail, data)], status_code, detail)
+    """
+    results: list[FolderOperationResult] = await FolderManager.batch_folders(
+        db=db, get_user=get_user, batch=batch
+    )
+    return SchemaResponse(
+        ResponseSchema[list[FolderOperationResult]](
+            data=results,
+            status_code=status.HTTP_200_OK,
+            detail="Successful"
+        )
+    )
+
+
+@router.get(path="/export")
+async def export_folders(
+        get_user: Annotated[dict, Depends(get_current_user)],
+) -> StreamingResponse:
+    """
+    Return a streaming NDJSON response with the all user's folders
+
+    :param get_user: dict - a user who requires to export their folders
+    :return: StreamingResponse - one (id, name, description, parent_id, user_id) json per line
+    """
+    return StreamingResponse(
+        FolderManager.export_folders(get_user=get_user),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post(path="/import", response_model=ResponseSchema[FoldersImportReport])
+async def import_folders(
+        db: Annotated[AsyncSession, Depends(get_db)],
+        get_user: Annotated[dict, Depends(get_current_user)],
+        request: Request
+)-> SchemaResponse:
+    """
+    Create folders from a request body streamed as NDJSON
+    and return a response with an import report
+
+    :param db: AsyncSession
+    :param get_user: dict - a user who requires to import folders
+    :param request: Request - one (ref, name, Optional[description, parent_ref, parent_id]) json per line
+    :return: SchemaResponse - (data: (total, created, errors), status_code, detail)
+    """
+    report: FoldersImportReport = await FolderManager.import_folders(
+        db=db, get_user=get_user, lines=iter_lines(request.stream())
+    )
+    return SchemaResponse(
+        ResponseSchema[FoldersImportReport](
+            data=report,
+            status_code=status.HTTP_200_OK,
+            detail="Successful"
+        )
+    )
+
+
+@router.get(path="/{folder_id}", response_model=ResponseSchema[ShowFolder])
+async def show_folder(
+        db: Annotated[AsyncSession, Depends(get_read_db)],
+        get_user: Annotated[dict, Depends(get_current_user)],
         folder_id: Annotated[UUID, Path()]
-)-> dict:
+)-> SchemaResponse:
     """
     Return a response with the folder data
 
     :param db: AsyncSession
     :param folder_id: UUID
     :param get_user: dict - a user who requires to show the folder
-    :return: dict - (id, name, description, parent_id, user_id)
+    :return: SchemaResponse - (id, name, description, parent_id, user_id)
+    """
+    folder_data: ShowFolder = await FolderManager.show_folder(db=db, get_user=get_user, folder_id=folder_id)
+    return SchemaResponse(
+        ResponseSchema[ShowFolder](
+            data=folder_data,
+            status_code=status.HTTP_200_OK,
+            detail="Successful"
+        )
+    )
+
+
+@router.get(path="/{folder_id}/tree", response_model=ResponseSchema[ShowFolder])
+async def show_folder_tree(
+        db: Annotated[AsyncSession, Depends(get_read_db)],
+        get_user: Annotated[dict, Depends(get_current_user)],
+        folder_id: Annotated[UUID, Path()],
+        max_depth: Annotated[int, Query(ge=0, le=FOLDER_TREE_MAX_DEPTH)] = FOLDER_TREE_MAX_DEPTH
+)-> SchemaResponse:
     """
-    folder_data: dict = await FolderManager.show_folder(db=db, get_user=get_user, folder_id=folder_id)
-    return {
-        "data": folder_data,
-        "status_code": status.HTTP_200_OK,
-        "detail": "Successful"
-    }
+    Return a response with the folder data and its nested children
 
+    :param db: AsyncSession
+    :param get_user: dict - a user who requires to show the folder tree
+    :param folder_id: UUID
+    :param max_depth: int - how many levels of children to return
+    :return: SchemaResponse - (id, name, description, parent_id, user_id, children)
+    """
+    folder_data: ShowFolder = await FolderManager.show_folder_tree(
+        db=db, get_user=get_user, folder_id=folder_id, max_depth=max_depth
+    )
+    return SchemaResponse(
+        ResponseSchema[ShowFolder](
+            data=folder_data,
+            status_code=status.HTTP_200_OK,
+            detail="Successful"
+        )
+    )
 
-@router.get(path="/", response_model=dict)
+
+@router.get(path="/", response_model=PageResponseSchema[list[ShowFolder]])
 async def list_folders(
-        db: Annotated[AsyncSession, Depends(get_db)],
+        db: Annotated[AsyncSession, Depends(get_read_db)],
         get_user: Annotated[dict, Depends(get_current_user)],
-)-> dict:
+        params: Annotated[ListFoldersParams, Query()]
+)-> SchemaResponse:
     """
-    Return a response with the all user's folder
+    Return a response with a page of the user's folders
 
     :param db: AsyncSession
     :param get_user: dict - a user who requires to list all their folders
-    :return: dict - (id, name, description, parent_id, user_id)
+    :param params: ListFoldersParams - (limit, Optional[cursor, is_active, is_private, parent_id])
+    :return: SchemaResponse - (data: folders_data, next_cursor, status_code, detail)
     """
-    folders_data: list[dict] = await FolderManager.list_folders(db=db, get_user=get_user)
-    return {
-        "data": folders_data,
-        "status_code": status.HTTP_200_OK,
-        "detail": "Successful"
-    }
+    folders_data, next_cursor = await FolderManager.list_folders(
+        db=db, get_user=get_user, params=params
+    )
+    return SchemaResponse(
+        PageResponseSchema[list[ShowFolder]](
+            data=folders_data,
+            next_cursor=next_cursor,
+            status_code=status.HTTP_200_OK,
+            detail="Successful"
+        )
+    )
 
 
-@router.put(path="/{folder_id}", response_model=dict)
+@router.put(path="/{folder_id}", response_model=ResponseSchema[ShowFolder])
 async def update_folder(
         db: Annotated[AsyncSession, Depends(get_db)],
         get_user: Annotated[dict, Depends(get_current_user)],
         folder_id: Annotated[UUID, Path()],
         updated_data: UpdateFolder
-) -> dict:
+) -> SchemaResponse:
     """
     Update a user data by user's id and return a response with user's data
 
@@ -91,36 +213,40 @@ async def update_folder(
     :param get_user: dict - the user who requires an update
     :param folder_id: UUID - folder's id which data needs to be updated
     :param updated_data: dict - Optional[name, description, is_active, parent_id]
-    :return: dict - (data: user_data, status_code, detail)
+    :return: SchemaResponse - (data: user_data, status_code, detail)
     """
-    folder_data: dict =  await FolderManager.update_folder(
+    folder_data: ShowFolder = await FolderManager.update_folder(
         db=db, get_user=get_user, folder_id=folder_id, updated_data=updated_data
     )
-    return {
-        "data": folder_data,
-        "status_code": status.HTTP_200_OK,
-        "detail": "Folder has been successfully updated"
-    }
+    return SchemaResponse(
+        ResponseSchema[ShowFolder](
+            data=folder_data,
+            status_code=status.HTTP_200_OK,
+            detail="Folder has been successfully updated"
+        )
+    )
 
 
-@router.delete(path="/{folder_id}", response_model=dict)
+@router.delete(path="/{folder_id}", response_model=ResponseSchema[None])
 async def delete_folder(
         db: Annotated[AsyncSession, Depends(get_db)],
         get_user: Annotated[dict, Depends(get_current_user)],
         folder_id: Annotated[UUID, Path()],
-) -> dict:
+) -> SchemaResponse:
     """
     Update a user data by user's id and return a response with user's data
 
     :param db: AsyncSession
     :param get_user: dict - the user who requires to delete a folder
     :param folder_id: UUID - folder's id which needs to be deleted
-    :return: dict
+    :return: SchemaResponse
     """
     await FolderManager.delete_folder(
         db=db, get_user=get_user, folder_id=folder_id
     )
-    return {
-        "status_code": status.HTTP_200_OK,
-        "detail": "Folder has been successfully deleted"
-    }
\ No newline at end of file
+    return SchemaResponse(
+        ResponseSchema[None](
+            status_code=status.HTTP_200_OK,
+            detail="Folder has been successfully deleted"
+        )
+    )
\ No newline at end of file
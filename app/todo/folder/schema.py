@@ -1,8 +1,15 @@
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+FOLDERS_PAGE_MAX_SIZE: int = 200
+FOLDER_TREE_MAX_DEPTH: int = 50
+FOLDERS_BATCH_MAX_SIZE: int = 500
+FOLDERS_IMPORT_CHUNK_SIZE: int = 1_000
+FOLDERS_IMPORT_MAX_LINES: int = 100_000
+FOLDERS_IMPORT_MAX_WAITING: int = 10_000
 
 class BaseFolder(BaseModel):
     name: Annotated[str, Field(min_length=1, max_length=100)]
@@ -18,7 +25,7 @@ class ShowFolder(BaseFolder):
     id: UUID
     is_active: bool
     user_id: UUID
-    children: list[dict] | None = None
+    children: list["ShowFolder"] | None = None
 
 
 class UpdateFolder(BaseFolder):
@@ -26,6 +33,77 @@ class UpdateFolder(BaseFolder):
     is_active: bool | None = None
 
 
+class ListFoldersParams(BaseModel):
+    limit: Annotated[int, Field(ge=1, le=FOLDERS_PAGE_MAX_SIZE)] = 50
+    cursor: str | None = None
+    is_active: bool | None = None
+    is_private: bool | None = None
+    parent_id: UUID | None = None
+
+
+class CreateFolderOperation(BaseModel):
+    action: Literal["create"]
+    data: CreateFolder
+
+
+class UpdateFolderOperation(BaseModel):
+    action: Literal["update"]
+    folder_id: UUID
+    data: UpdateFolder
+
+
+class DeleteFolderOperation(BaseModel):
+    action: Literal["delete"]
+    folder_id: UUID
+
+
+FolderOperation = Annotated[
+    CreateFolderOperation | UpdateFolderOperation | DeleteFolderOperation,
+    Field(discriminator="action")
+]
+
+
+class FolderBatch(BaseModel):
+    operations: Annotated[list[FolderOperation], Field(min_length=1, max_length=FOLDERS_BATCH_MAX_SIZE)]
+
+
+class ImportFolder(BaseFolder):
+    """
+    A folder line of an import. ref is a client-side id,
+    a parent is given either by parent_ref of an earlier or later line
+    or by parent_id of an existing folder
+    """
+
+    ref: Annotated[str, Field(min_length=1, max_length=100)]
+    parent_ref: Annotated[str | None, Field(min_length=1, max_length=100)] = None
+
+    @model_validator(mode="after")
+    def check_one_parent(self) -> "ImportFolder":
+        if self.parent_ref is not None and self.parent_id is not None:
+            raise ValueError("Give either parent_ref or parent_id")
+        return self
+
+
+class FolderImportError(BaseModel):
+    line: int
+    ref: str | None = None
+    detail: str
+
+
+class FoldersImportReport(BaseModel):
+    total: int
+    created: int
+    errors: list[FolderImportError]
+
+
+class FolderOperationResult(BaseModel):
+    action: str
+    folder_id: UUID | None = None
+    status_code: int
+    detail: str
+    data: ShowFolder | None = None
+
+
 # class ShowChildFolder(BaseModel):
 #     id: UUID
 #     name: str
@@ -1,13 +1,45 @@
-from uuid import UUID
+import base64
+import binascii
+from datetime import datetime
+from typing import AsyncIterator
+from types import SimpleNamespace
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import (
+    select, tuple_, literal_column, Integer, update, func, Row, insert, delete, or_, and_,
+    exists, ColumnElement
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from starlette import status
 
-from app.todo.folder.exceptions import FolderExceptionManager
+from app.backend.db import async_session_maker
+from app.backend.projection import schema_columns, row_to_schema
+from app.auth.exceptions import user_have_no_admin_permissions
+from app.todo.folder.exceptions import (
+    FolderExceptionManager,
+    FolderChecks,
+    _is_hidden_private_folder,
+    folder_not_exist,
+    folder_moved_inside_itself,
+    name_is_taken_by_user,
+    other_user_parent_folder,
+)
 from app.todo.folder.model import Folder
-from app.todo.folder.schema import CreateFolder, ShowFolder, UpdateFolder
+from app.todo.folder.schema import (
+    CreateFolder,
+    ShowFolder,
+    UpdateFolder,
+    UpdateFolderOperation,
+    ListFoldersParams,
+    FolderBatch,
+    FolderOperationResult,
+    FoldersImportReport,
+)
+from app.todo.folder.folder_import import import_folders
+
+FOLDERS_EXPORT_CHUNK_SIZE: int = 500
 
 
 # async def _get_children_dict(db: AsyncSession, parent_id: UUID) -> list[dict]:
@@ -15,6 +47,285 @@ from app.todo.folder.schema import CreateFolder, ShowFolder, UpdateFolder
 #     return [ShowChildFolder(**child.__dict__).model_dump() for child in children]
 
 
+def _encode_cursor(created_at: datetime, folder_id: UUID) -> str:
+    """
+    Return an opaque cursor pointing after a given folder
+
+    :param created_at: datetime
+    :param folder_id: UUID
+    :return: str
+    """
+
+    raw: str = f"{created_at.isoformat()}|{folder_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Return (created_at, id) of the folder a cursor points after
+    or get an Exception
+
+    :param cursor: str
+    :return: tuple - (created_at, id)
+    """
+
+    try:
+        created_at, folder_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(folder_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def _replace_path_prefix(db: AsyncSession, old_path: str, new_path) -> None:
+    """
+    Rewrite materialized paths of a folder and all its descendants
+    from old_path prefix to new_path in one UPDATE statement
+
+    :param db: AsyncSession
+    :param old_path: str - current path of the moved folder
+    :param new_path: str | ColumnElement - new path of the moved folder
+    :return: None
+    """
+
+    await db.execute(
+        update(Folder)
+        .filter(Folder.path.startswith(old_path))
+        .values(path=func.concat(new_path, func.substr(Folder.path, len(old_path) + 1)))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _move_folder_subtree(db: AsyncSession, folder: Folder | Row) -> None:
+    """
+    Rewrite materialized paths of a folder and all its descendants
+    after the folder got a new parent_id
+
+    :param db: AsyncSession
+    :param folder: Folder | Row - with the new parent_id and the old path
+    :return: None
+    """
+
+    if folder.parent_id is None:
+        await _replace_path_prefix(
+            db=db, old_path=folder.path, new_path=Folder.build_path(None, folder.id)
+        )
+        return
+    parent: type[Folder] = aliased(Folder)
+    parent_path = (
+        select(parent.path)
+        .filter(parent.id == folder.parent_id)
+        .scalar_subquery()
+    )
+    await _replace_path_prefix(
+        db=db, old_path=folder.path, new_path=func.concat(parent_path, f"{folder.id.hex}/")
+    )
+
+
+async def _lock_moved_folders(db: AsyncSession, folder_ids: set[UUID], parent_ids: set[UUID]) -> None:
+    """
+    Lock moved folders and their new parents with all ancestors of the parents
+    in the order of ids before the moves are checked.
+    Concurrent moves which could make a cycle (A under B and B under A
+    or under their descendants) lock a common folder, so the second one waits
+    and checks the cycle against the committed paths of the first one
+
+    :param db: AsyncSession
+    :param folder_ids: set[UUID] - moved folders
+    :param parent_ids: set[UUID] - their new parents
+    :return: None
+    """
+
+    if not parent_ids:
+        return
+    locked_ids: set[UUID] = set(folder_ids)
+    for path in await db.scalars(select(Folder.path).filter(Folder.id.in_(parent_ids))):
+        locked_ids.update(UUID(hex=folder_hex) for folder_hex in path.strip("/").split("/"))
+    await db.execute(
+        select(Folder.id)
+        .filter(Folder.id.in_(locked_ids))
+        .order_by(Folder.id)
+        .with_for_update()
+    )
+
+
+def _folder_update_values(updated_data: UpdateFolder) -> dict:
+    """
+    Return the fields given in an update, None is kept
+    only for nullable columns (e.g. parent_id: None makes a folder a root one)
+
+    :param updated_data: UpdateFolder
+    :return: dict
+    """
+
+    return {
+        key: value
+        for key, value in updated_data.model_dump(exclude_unset=True).items()
+        if value is not None or Folder.__table__.c[key].nullable
+    }
+
+
+def _folder_write_condition(
+        folder_id: UUID, get_user: dict, values: dict
+) -> ColumnElement[bool]:
+    """
+    Return a WHERE condition of a folder update which matches the folder
+    only if the update passes the same rules update_folder_exceptions checks:
+    the owner or an admin changes it, the new name isn't taken by the current user,
+    the new parent is the current user's folder outside of the moved one
+
+    :param folder_id: UUID
+    :param get_user: dict
+    :param values: dict - updated columns
+    :return: ColumnElement[bool]
+    """
+
+    conditions: list[ColumnElement[bool]] = [Folder.id == folder_id]
+    if not get_user["is_superuser"]:
+        conditions.append(Folder.user_id == get_user["id"])
+    if values.get("name") is not None:
+        other: type[Folder] = aliased(Folder)
+        conditions.append(
+            or_(
+                Folder.name == values["name"],
+                ~exists().where(
+                    other.user_id == get_user["id"],
+                    other.name == values["name"],
+                    other.id != folder_id
+                )
+            )
+        )
+    if values.get("parent_id") is not None:
+        parent: type[Folder] = aliased(Folder)
+        conditions.append(
+            exists().where(
+                parent.id == values["parent_id"],
+                parent.user_id == get_user["id"],
+                or_(
+                    Folder.parent_id == values["parent_id"],
+                    ~parent.path.startswith(Folder.path)
+                )
+            )
+        )
+    return and_(*conditions)
+
+
+class _FolderBatchState:
+    """
+    In-memory view of the folders a batch touches,
+    which is updated while the operations are validated one by one
+    so later operations see the effect of earlier ones
+    """
+
+    def __init__(self, folders: dict[UUID, SimpleNamespace], taken_names: dict[str, UUID]) -> None:
+        self.folders: dict[UUID, SimpleNamespace] = folders
+        self.taken_names: dict[str, UUID] = taken_names
+        self.deleted_paths: list[str] = []
+        self.inserts: list[dict] = []
+        self.updates: dict[UUID, dict] = {}
+        self.moves: list[tuple[str, str]] = []
+        self.deleted_ids: set[UUID] = set()
+
+    def get(self, folder_id: UUID | None) -> SimpleNamespace | None:
+        folder: SimpleNamespace | None = self.folders.get(folder_id)
+        if folder is None or any(folder.path.startswith(path) for path in self.deleted_paths):
+            return None
+        return folder
+
+    def checks(self, folder_name: str | None, parent_id: UUID | None) -> FolderChecks:
+        parent: SimpleNamespace | None = self.get(parent_id)
+        return FolderChecks(
+            is_name_taken=folder_name is not None and folder_name in self.taken_names,
+            parent_user_id=parent.user_id if parent else None,
+            parent_path=parent.path if parent else None
+        )
+
+    def create(self, get_user: dict, folder_data: CreateFolder) -> ShowFolder:
+        checks: FolderChecks = self.checks(folder_data.name, folder_data.parent_id)
+        name_is_taken_by_user(checks=checks)
+        other_user_parent_folder(checks=checks, get_user=get_user, folder_data=folder_data)
+
+        folder_id: UUID = uuid4()
+        new_folder: dict = {
+            **folder_data.model_dump(),
+            "id": folder_id,
+            "user_id": UUID(str(get_user["id"])),
+            "path": Folder.build_path(checks.parent_path, folder_id),
+            "is_active": True,
+            "is_private": True,
+        }
+        self.inserts.append(new_folder)
+        self.folders[folder_id] = SimpleNamespace(**new_folder)
+        self.taken_names[folder_data.name] = folder_id
+        return ShowFolder.model_validate(new_folder)
+
+    def update(self, get_user: dict, folder_id: UUID, updated_data: UpdateFolder) -> ShowFolder:
+        folder: SimpleNamespace | None = self.get(folder_id)
+        folder_not_exist(folder=folder)
+        user_have_no_admin_permissions(get_user=get_user, user_id=str(folder.user_id))
+        is_name_changed: bool = bool(updated_data.name) and updated_data.name != folder.name
+        checks: FolderChecks = self.checks(
+            updated_data.name if is_name_changed else None, updated_data.parent_id
+        )
+        name_is_taken_by_user(checks=checks, action_name="update")
+        other_user_parent_folder(
+            checks=checks, get_user=get_user, folder_data=updated_data, action_name="update"
+        )
+        values: dict = {
+            key: value for key, value in _folder_update_values(updated_data).items()
+            if getattr(folder, key) != value
+        }
+        if "parent_id" in values:
+            folder_moved_inside_itself(folder=folder, parent_path=checks.parent_path)
+            self._move(folder, Folder.build_path(checks.parent_path, folder.id))
+        if "name" in values:
+            if self.taken_names.get(folder.name) == folder.id:
+                del self.taken_names[folder.name]
+            self.taken_names[values["name"]] = folder.id
+        for key, value in values.items():
+            setattr(folder, key, value)
+        if values:
+            self.updates.setdefault(folder.id, {}).update(values)
+        return ShowFolder.model_validate(folder, from_attributes=True)
+
+    def delete(self, get_user: dict, folder_id: UUID) -> None:
+        folder: SimpleNamespace | None = self.get(folder_id)
+        folder_not_exist(folder=folder)
+        user_have_no_admin_permissions(get_user=get_user, user_id=str(folder.user_id))
+        for name, named_folder_id in list(self.taken_names.items()):
+            named_folder: SimpleNamespace | None = self.folders.get(named_folder_id)
+            if named_folder is not None and named_folder.path.startswith(folder.path):
+                del self.taken_names[name]
+        self.deleted_paths.append(folder.path)
+        self.deleted_ids.add(folder.id)
+
+    def _move(self, folder: SimpleNamespace, new_path: str) -> None:
+        old_path: str = folder.path
+        self.moves.append((old_path, new_path))
+        for known_folder in self.folders.values():
+            if known_folder.path.startswith(old_path):
+                known_folder.path = new_path + known_folder.path[len(old_path):]
+        self.deleted_paths = [
+            new_path + path[len(old_path):] if path.startswith(old_path) else path
+            for path in self.deleted_paths
+        ]
+
+    async def apply(self, db: AsyncSession) -> None:
+        if self.inserts:
+            await db.execute(insert(Folder), self.inserts)
+        if self.updates:
+            await db.execute(
+                update(Folder),
+                [{"id": folder_id, **values} for folder_id, values in self.updates.items()]
+            )
+        for old_path, new_path in self.moves:
+            await _replace_path_prefix(db=db, old_path=old_path, new_path=new_path)
+        if self.deleted_ids:
+            await db.execute(delete(Folder).filter(Folder.id.in_(self.deleted_ids)))
+
+
 class FolderManager:
     """
     Class which contains main static methods
@@ -25,69 +336,184 @@ class FolderManager:
     @staticmethod
     async def create_folder(
             db: AsyncSession, get_user: dict, folder_data: CreateFolder
-    )-> dict:
+    )-> ShowFolder:
         """
-        Create a new folder to give back a dict with folder data
+        Create a new folder to give back the folder data
         or get an Exception
 
         :param db: AsyncSession
         :param get_user: dict
         :param folder_data: CreateFolder - (name, Optional[description, parent_id])
-        :return: dict - (id, name, description, parent_id, user_id)
+        :return: ShowFolder - (id, name, description, parent_id, user_id)
         """
-        await FolderExceptionManager.create_folder_exceptions(
+        parent_path: str | None = await FolderExceptionManager.create_folder_exceptions(
             db=db, get_user=get_user, folder_data=folder_data
         )
+        new_folder_id: UUID = uuid4()
         new_folder: Folder = Folder(
             **folder_data.model_dump(),
-            user_id=get_user["id"]
+            id=new_folder_id,
+            user_id=get_user["id"],
+            path=Folder.build_path(parent_path, new_folder_id)
         )
         db.add(new_folder)
         await db.commit()
         if not new_folder.id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="something got wrong with creation")
-        return ShowFolder(**new_folder.__dict__).model_dump()
+        return ShowFolder.model_validate(new_folder, from_attributes=True)
 
 
     @staticmethod
     async def show_folder(
             db: AsyncSession, get_user: dict, folder_id: UUID
-    )-> dict:
-        folder: Folder | None = await db.scalar(select(Folder).filter_by(id=folder_id))
+    )-> ShowFolder:
+        folder: Row | None = (
+            await db.execute(
+                select(*schema_columns(Folder, ShowFolder, "is_private"))
+                .filter_by(id=folder_id)
+            )
+        ).one_or_none()
         FolderExceptionManager.show_folder_exceptions(folder, get_user)
         #children: list[dict] = await FolderManager.get_children_dict(db=db, parent_id=folder.id)
-        return ShowFolder(
-            **folder.__dict__,
-            #children=children
-        ).model_dump()
+        return row_to_schema(folder, ShowFolder)
+
+
+    @staticmethod
+    async def show_folder_tree(
+            db: AsyncSession, get_user: dict, folder_id: UUID, max_depth: int
+    ) -> ShowFolder:
+        """
+        Return back a folder with its nested children up to max_depth levels
+        loaded by one recursive query or get an Exception.
+        Private subfolders of other users are skipped with their children
+
+        :param db: AsyncSession
+        :param get_user: dict
+        :param folder_id: UUID
+        :param max_depth: int - 0 returns the folder without children
+        :return: ShowFolder - (id, name, description, parent_id, user_id, children)
+        """
+
+        tree = (
+            select(Folder.id, literal_column("0", Integer).label("depth"))
+            .filter(Folder.id == folder_id)
+            .cte(name="folder_tree", recursive=True)
+        )
+        tree = tree.union_all(
+            select(Folder.id, (tree.c.depth + 1).label("depth"))
+            .join(tree, Folder.parent_id == tree.c.id)
+            .filter(tree.c.depth < max_depth)
+        )
+        folders: list[Row] = list(
+            await db.execute(
+                select(*schema_columns(Folder, ShowFolder, "is_private"))
+                .join(tree, Folder.id == tree.c.id)
+                .order_by(tree.c.depth, Folder.created_at, Folder.id)
+            )
+        )
+        root: Row | None = folders[0] if folders else None
+        FolderExceptionManager.show_folder_exceptions(root, get_user)
+
+        nodes: dict[UUID, ShowFolder] = {root.id: row_to_schema(root, ShowFolder, children=[])}
+        for folder in folders[1:]:
+            if (
+                    folder.parent_id not in nodes
+                    or _is_hidden_private_folder(folder=folder, get_user=get_user)
+            ):
+                continue
+            node: ShowFolder = row_to_schema(folder, ShowFolder, children=[])
+            nodes[folder.id] = node
+            nodes[folder.parent_id].children.append(node)
+        return nodes[root.id]
 
 
     @staticmethod
     async def list_folders(
-            db: AsyncSession, get_user: dict
-    )-> list[dict]:
-        folders: list[Folder] | None = list(
-            await db.scalars(
-                select(Folder)
-                .filter_by(user_id=get_user["id"])
+            db: AsyncSession, get_user: dict, params: ListFoldersParams
+    )-> tuple[list[ShowFolder], str | None]:
+        """
+        Return a page of the user's folders ordered by (created_at, id)
+        and a cursor of the next page or None if it is the last one
+
+        :param db: AsyncSession
+        :param get_user: dict
+        :param params: ListFoldersParams - (limit, Optional[cursor, is_active, is_private, parent_id])
+        :return: tuple - (list of folders data, next_cursor)
+        """
+
+        query = (
+            select(*schema_columns(Folder, ShowFolder, "created_at"))
+            .filter_by(user_id=get_user["id"])
+        )
+        for field in ("is_active", "is_private", "parent_id"):
+            value = getattr(params, field)
+            if value is not None:
+                query = query.filter(getattr(Folder, field) == value)
+        if params.cursor:
+            query = query.filter(
+                tuple_(Folder.created_at, Folder.id) > _decode_cursor(params.cursor)
+            )
+        folders: list[Row] = list(
+            await db.execute(
+                query
+                .order_by(Folder.created_at, Folder.id)
+                .limit(params.limit + 1)
             )
         )
-        folders_list: list[dict] = []
-        for folder in folders:
-            #children: list[dict] = await FolderManager.get_children_dict(db=db, parent_id=folder.id)
-            folders_list.append(
-                ShowFolder(
-                    **folder.__dict__,
-                    #children=children
-                ).model_dump()
+        next_cursor: str | None = None
+        if len(folders) > params.limit:
+            folders = folders[:params.limit]
+            next_cursor = _encode_cursor(folders[-1].created_at, folders[-1].id)
+        folders_list: list[ShowFolder] = [
+            row_to_schema(folder, ShowFolder) for folder in folders
+        ]
+        return folders_list, next_cursor
+
+
+    @staticmethod
+    async def export_folders(get_user: dict) -> AsyncIterator[bytes]:
+        """
+        Yield all the user's folders as NDJSON lines
+        reading them through a server-side cursor.
+        The generator opens its own session because it runs
+        after the request's dependencies have been closed
+
+        :param get_user: dict
+        :return: AsyncIterator[bytes] - one (id, name, description, parent_id, user_id) json per line
+        """
+
+        async with async_session_maker() as db:
+            folders = await db.stream(
+                select(*schema_columns(Folder, ShowFolder))
+                .filter_by(user_id=get_user["id"])
+                .order_by(Folder.created_at, Folder.id)
+                .execution_options(yield_per=FOLDERS_EXPORT_CHUNK_SIZE)
             )
-        return folders_list
+            async for folder in folders:
+                yield row_to_schema(folder, ShowFolder).model_dump_json().encode() + b"\n"
+
+
+    @staticmethod
+    async def import_folders(
+            db: AsyncSession, get_user: dict, lines: AsyncIterator[str]
+    ) -> FoldersImportReport:
+        """
+        Create the user's folders of NDJSON lines with client-side refs
+        in one transaction, lines which can't be created are reported by line numbers
+
+        :param db: AsyncSession
+        :param get_user: dict
+        :param lines: AsyncIterator[str] - one (ref, name, Optional[description, parent_ref, parent_id]) json per line
+        :return: FoldersImportReport - (total, created, errors)
+        """
+
+        return await import_folders(db=db, get_user=get_user, lines=lines)
 
 
     @staticmethod
     async def update_folder(
             db: AsyncSession, folder_id: UUID, get_user: dict, updated_data: UpdateFolder
-    ) -> dict:
+    ) -> ShowFolder:
         """
         Update a folder data with updated fields by a user's id
         and return back and updated info
@@ -97,24 +523,147 @@ class FolderManager:
         :param folder_id: UUID
         :param get_user: dict
         :param updated_data: UpdateUser - Optional[username, fullname]
-        :return: dict - (id, email, username, fullname)
+        :return: ShowFolder - (id, name, description, parent_id, user_id)
         """
 
-        target_folder: Folder | None = await db.scalar(
-            select(Folder).filter_by(id=folder_id)
+        values: dict = _folder_update_values(updated_data)
+        if values.get("parent_id") is not None:
+            await _lock_moved_folders(db=db, folder_ids={folder_id}, parent_ids={values["parent_id"]})
+        condition = _folder_write_condition(
+            folder_id=folder_id, get_user=get_user, values=values
+        )
+        columns = schema_columns(Folder, ShowFolder, "path")
+        statement = select(*columns).where(condition)
+        if values:
+            statement = (
+                update(Folder)
+                .where(condition)
+                .values(**values)
+                .returning(*columns)
+                .execution_options(synchronize_session=False)
+            )
+        folder: Row | None = (await db.execute(statement)).one_or_none()
+        if folder is None:
+            await FolderExceptionManager.update_folder_exceptions(
+                folder=(
+                    await db.execute(
+                        select(Folder.id, Folder.user_id, Folder.name, Folder.parent_id, Folder.path)
+                        .filter_by(id=folder_id)
+                    )
+                ).one_or_none(),
+                get_user=get_user,
+                updated_data=updated_data,
+                db=db
+            )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The folder has been changed by another request, try again"
+            )
+        if "parent_id" in values:
+            await _move_folder_subtree(db=db, folder=folder)
+        await db.commit()
+        return row_to_schema(folder, ShowFolder)
+
+
+    @staticmethod
+    async def batch_folders(
+            db: AsyncSession, get_user: dict, batch: FolderBatch
+    ) -> list[FolderOperationResult]:
+        """
+        Validate a list of create/update/delete folder operations
+        against the folders loaded with one query and apply the valid ones
+        with bulk INSERT/UPDATE/DELETE statements in one transaction
+
+        :param db: AsyncSession
+        :param get_user: dict
+        :param batch: FolderBatch - (operations)
+        :return: list[FolderOperationResult] - (action, folder_id, status_code, detail, data) per operation
+        """
+
+        folder_ids: set[UUID] = set()
+        names: set[str] = set()
+        for operation in batch.operations:
+            if operation.action != "create":
+                folder_ids.add(operation.folder_id)
+            if operation.action != "delete":
+                if operation.data.parent_id:
+                    folder_ids.add(operation.data.parent_id)
+                if operation.data.name:
+                    names.add(operation.data.name)
+
+        moves: list[UpdateFolderOperation] = [
+            operation for operation in batch.operations
+            if operation.action == "update" and operation.data.parent_id
+        ]
+        await _lock_moved_folders(
+            db=db,
+            folder_ids={operation.folder_id for operation in moves},
+            parent_ids={operation.data.parent_id for operation in moves}
         )
-        await FolderExceptionManager.update_folder_exceptions(
-            folder=target_folder, get_user=get_user, updated_data=updated_data, db=db
+        rows: list[Row] = list(
+            await db.execute(
+                select(*schema_columns(Folder, ShowFolder, "is_private", "path"))
+                .filter(
+                    or_(
+                        Folder.id.in_(folder_ids),
+                        and_(Folder.user_id == get_user["id"], Folder.name.in_(names))
+                    )
+                )
+            )
+        )
+        state: _FolderBatchState = _FolderBatchState(
+            folders={row.id: SimpleNamespace(**row._mapping) for row in rows},
+            taken_names={
+                row.name: row.id for row in rows
+                if str(row.user_id) == str(get_user["id"]) and row.name in names
+            }
         )
 
-        for key, value in updated_data.model_dump().items():
-            if value:
-                if getattr(target_folder, key) != value:
-                    setattr(target_folder, key, value)
-        if db.dirty:
-            await db.commit()
-            await db.refresh(target_folder)
-        return ShowFolder(**target_folder.__dict__).model_dump()
+        results: list[FolderOperationResult] = []
+        for operation in batch.operations:
+            folder_id: UUID | None = getattr(operation, "folder_id", None)
+            try:
+                if operation.action == "create":
+                    folder_data: ShowFolder = state.create(
+                        get_user=get_user, folder_data=operation.data
+                    )
+                    results.append(FolderOperationResult(
+                        action=operation.action,
+                        folder_id=folder_data.id,
+                        status_code=status.HTTP_201_CREATED,
+                        detail="Successful",
+                        data=folder_data
+                    ))
+                elif operation.action == "update":
+                    folder_data: ShowFolder = state.update(
+                        get_user=get_user, folder_id=folder_id, updated_data=operation.data
+                    )
+                    results.append(FolderOperationResult(
+                        action=operation.action,
+                        folder_id=folder_id,
+                        status_code=status.HTTP_200_OK,
+                        detail="Folder has been successfully updated",
+                        data=folder_data
+                    ))
+                else:
+                    state.delete(get_user=get_user, folder_id=folder_id)
+                    results.append(FolderOperationResult(
+                        action=operation.action,
+                        folder_id=folder_id,
+                        status_code=status.HTTP_200_OK,
+                        detail="Folder has been successfully deleted"
+                    ))
+            except HTTPException as error:
+                results.append(FolderOperationResult(
+                    action=operation.action,
+                    folder_id=folder_id,
+                    status_code=error.status_code,
+                    detail=error.detail
+                ))
+
+        await state.apply(db=db)
+        await db.commit()
+        return results
 
 
     @staticmethod
@@ -7,8 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy_utils import database_exists, create_database, drop_database
 
 from app.auth.auth_router import get_current_user
+from app.auth.token_cache import token_cache
+from app.auth.user_cache import user_cache
 from app.backend.config import settings
-from app.backend.db import sync_engine, Base, async_engine, async_session_maker
+from app.backend.db import get_sync_engine, Base, async_engine, async_read_engine, async_session_maker
 from app.main import app
 
 DEFAULT_DROP_DB_FLAG: str = "false"
@@ -44,6 +46,9 @@ async def async_setup() -> None:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     await async_engine.dispose()
+    await async_read_engine.dispose()
+    await user_cache.clear()
+    token_cache.clear()
 
 
 def pytest_addoption(parser) -> None:
@@ -64,8 +69,10 @@ def drop_db(does_drop_db) -> None:
     yield
     if does_drop_db == "true":
         assert settings.MODE == "TEST"
+        sync_engine = get_sync_engine()
         if database_exists(sync_engine.url):
             drop_database(sync_engine.url)
+        sync_engine.dispose()
 
 
 @pytest_asyncio.fixture
@@ -1,7 +1,8 @@
 import pytest
 import pytest_asyncio
 
-from app.auth.auth_router import bcrypt_context, get_current_user
+from app.auth.auth_router import get_current_user
+from app.auth.hashing import bcrypt_context
 from app.auth.model import User
 from app.main import app
 
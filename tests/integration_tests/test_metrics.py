@@ -0,0 +1,30 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette import status
+
+from app.main import app
+
+
+class TestMetrics:
+    """Test a route for exporting Prometheus metrics"""
+
+    @pytest.mark.asyncio
+    async def test_metrics_positive(self) -> None:
+        """Test metrics are exported in the text format with a handled request"""
+
+        async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://127.0.0.1:8000"
+        ) as client:
+            await client.get("/api/v1/")
+            response = await client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_requests_total{method="GET",route="/api/v1/"}' in response.text
+        for name in (
+                "db_pool_checked_out",
+                "db_pool_overflow",
+                "event_loop_lag_seconds_bucket",
+                "password_hash_queue_depth",
+        ):
+            assert f"# TYPE {name.removesuffix('_bucket')}" in response.text
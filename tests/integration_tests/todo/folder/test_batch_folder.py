@@ -0,0 +1,152 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.auth.model import User
+from app.todo.folder.model import Folder
+
+
+class TestBatchFolder:
+    """Test a route for applying a batch of folder operations"""
+
+    @pytest.mark.asyncio
+    async def test_batch_folders_not_auth(
+            self,
+            async_folder_client: AsyncClient,
+            folder_data: dict
+    ) -> None:
+        """Test response with not auth data"""
+
+        response = await async_folder_client.post(
+            url="/batch", json={"operations": [{"action": "create", "data": folder_data}]}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Not authenticated"
+
+
+    @pytest.mark.asyncio
+    async def test_batch_folders_positive(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            db_test: AsyncSession,
+            folder_data: dict,
+            user_1: User,
+            user_folder: Folder,
+            user_nested_folder: Folder,
+            user_nested_nested_folder: Folder,
+            admin_folder: Folder
+    ) -> None:
+        """Test per-operation results of a mixed batch"""
+
+        operations: list[dict] = [
+            {"action": "create", "data": {**folder_data, "parent_id": str(user_folder.id)}},
+            {"action": "create", "data": {"name": user_folder.name}},
+            {
+                "action": "update",
+                "folder_id": str(user_nested_nested_folder.id),
+                "data": {"description": "Some description"}
+            },
+            {"action": "delete", "folder_id": str(admin_folder.id)},
+            {"action": "delete", "folder_id": str(user_nested_folder.id)},
+        ]
+        response = await async_folder_client.post(url="/batch", json={"operations": operations})
+        assert response.status_code == status.HTTP_200_OK
+        results: list[dict] = response.json()["data"]
+        assert [result["status_code"] for result in results] == [
+            status.HTTP_201_CREATED,
+            status.HTTP_403_FORBIDDEN,
+            status.HTTP_200_OK,
+            status.HTTP_403_FORBIDDEN,
+            status.HTTP_200_OK,
+        ]
+        assert results[1]["detail"] == "You can't create a folder with the same name which you already have"
+        assert results[3]["detail"] == "You don't have admin permission"
+
+        new_folder: Folder | None = await db_test.scalar(
+            select(Folder).filter_by(id=results[0]["folder_id"])
+        )
+        assert new_folder.parent_id == user_folder.id
+        assert new_folder.path == Folder.build_path(user_folder.path, new_folder.id)
+        assert await db_test.scalar(select(Folder).filter_by(id=user_nested_folder.id)) is None
+        assert await db_test.scalar(select(Folder).filter_by(id=user_nested_nested_folder.id)) is None
+        assert await db_test.scalar(select(Folder).filter_by(id=admin_folder.id))
+
+
+    @pytest.mark.asyncio
+    async def test_batch_folders_delete_then_move_ancestor(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            db_test: AsyncSession,
+            user_1: User,
+            user_nested_folder: Folder,
+            user_nested_nested_folder: Folder
+    ) -> None:
+        """Test a deleted folder stays deleted after its ancestor is moved in the same batch"""
+
+        other_root: Folder = Folder(name="Other User Folder", user_id=user_1.id)
+        db_test.add(other_root)
+        await db_test.commit()
+
+        operations: list[dict] = [
+            {"action": "delete", "folder_id": str(user_nested_nested_folder.id)},
+            {
+                "action": "update",
+                "folder_id": str(user_nested_folder.id),
+                "data": {"parent_id": str(other_root.id)}
+            },
+            {
+                "action": "update",
+                "folder_id": str(user_nested_nested_folder.id),
+                "data": {"description": "Some description"}
+            },
+        ]
+        response = await async_folder_client.post(url="/batch", json={"operations": operations})
+        results: list[dict] = response.json()["data"]
+        assert [result["status_code"] for result in results] == [
+            status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_404_NOT_FOUND
+        ]
+        moved_folder: Folder = await db_test.scalar(
+            select(Folder).filter_by(id=user_nested_folder.id).execution_options(populate_existing=True)
+        )
+        assert moved_folder.path == Folder.build_path(other_root.path, moved_folder.id)
+
+
+    @pytest.mark.asyncio
+    async def test_batch_folders_update_to_false_and_null(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            db_test: AsyncSession,
+            user_nested_folder: Folder
+    ) -> None:
+        """Test an update which sets is_active to false, the description to null
+        and makes a nested folder a root one"""
+
+        user_nested_folder.description = "Some description"
+        await db_test.commit()
+
+        operations: list[dict] = [
+            {
+                "action": "update",
+                "folder_id": str(user_nested_folder.id),
+                "data": {"is_active": False, "description": None, "parent_id": None}
+            },
+        ]
+        response = await async_folder_client.post(url="/batch", json={"operations": operations})
+        result: dict = response.json()["data"][0]
+        assert result["status_code"] == status.HTTP_200_OK
+        assert result["data"]["is_active"] is False
+        assert result["data"]["description"] is None
+        assert result["data"]["parent_id"] is None
+
+        folder: Folder = await db_test.scalar(
+            select(Folder).filter_by(id=user_nested_folder.id).execution_options(populate_existing=True)
+        )
+        assert not folder.is_active
+        assert folder.description is None
+        assert folder.parent_id is None
+        assert folder.path == Folder.build_path(None, folder.id)
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from starlette import status
+
+from app.auth.model import User
+from app.todo.folder.model import Folder
+
+
+class TestExportFolder:
+    """Test a route for exporting all user's folders as NDJSON"""
+
+    @pytest.mark.asyncio
+    async def test_export_folders_not_auth(
+            self, async_folder_client: AsyncClient
+    ) -> None:
+        """Test response with not auth data"""
+
+        response = await async_folder_client.get(url="/export")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Not authenticated"
+
+
+    @pytest.mark.asyncio
+    async def test_export_folders_positive(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            user_1: User,
+            folders: list[Folder]
+    ) -> None:
+        """Test response with a positive test case"""
+
+        response = await async_folder_client.get(url="/export")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows: list[dict] = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 3
+        assert {row["user_id"] for row in rows} == {str(user_1.id)}
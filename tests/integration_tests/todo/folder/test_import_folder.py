@@ -0,0 +1,131 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.auth.model import User
+from app.todo.folder import folder_import
+from app.todo.folder.model import Folder
+
+
+class TestImportFolder:
+    """Test a route for importing folders from NDJSON"""
+
+    @pytest.mark.asyncio
+    async def test_import_folders_not_auth(
+            self, async_folder_client: AsyncClient
+    ) -> None:
+        """Test response with not auth data"""
+
+        response = await async_folder_client.post(url="/import", content=b"")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Not authenticated"
+
+
+    @pytest.mark.asyncio
+    async def test_import_folders_positive(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            user_1: User,
+            folders: list[Folder],
+            db_test: AsyncSession
+    ) -> None:
+        """Test children given before their parents, taken names
+        and a parent which is an existing folder"""
+
+        lines: list[dict] = [
+            {"ref": "child", "parent_ref": "root", "name": "Imported child"},
+            {"ref": "root", "parent_id": str(folders[0].id), "name": "Imported root"},
+            {"ref": "taken", "name": "Test User Folder"},
+            {"ref": "orphan", "parent_ref": "taken", "name": "Imported orphan"},
+            {"ref": "admin", "parent_id": str(folders[1].id), "name": "Imported admin"},
+        ]
+        response = await async_folder_client.post(
+            url="/import", content="\n".join(json.dumps(line) for line in lines).encode()
+        )
+        assert response.status_code == status.HTTP_200_OK
+        report: dict = response.json()["data"]
+        assert report["total"] == 5
+        assert report["created"] == 2
+        assert [error["ref"] for error in report["errors"]] == ["taken", "orphan", "admin"]
+
+        imported: dict[str, Folder] = {
+            folder.name: folder
+            for folder in await db_test.scalars(
+                select(Folder).filter(Folder.name.in_(["Imported root", "Imported child"]))
+            )
+        }
+        root, child = imported["Imported root"], imported["Imported child"]
+        assert root.user_id == user_1.id and root.parent_id == folders[0].id
+        assert child.parent_id == root.id
+        assert child.path == f"{folders[0].path}{root.id.hex}/{child.id.hex}/"
+
+
+    @pytest.mark.asyncio
+    async def test_import_folders_failed_line_keeps_no_name(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            db_test: AsyncSession
+    ) -> None:
+        """Test a name of a line which hasn't been created stays free
+        and a released line fails when its name has been taken meanwhile"""
+
+        lines: list[dict] = [
+            {"ref": "lost", "parent_ref": "missing", "name": "Imported same"},
+            {"ref": "late", "parent_ref": "parent", "name": "Imported same"},
+            {"ref": "free", "name": "Imported same"},
+            {"ref": "parent", "name": "Imported parent"},
+        ]
+        response = await async_folder_client.post(
+            url="/import", content="\n".join(json.dumps(line) for line in lines).encode()
+        )
+        assert response.status_code == status.HTTP_200_OK
+        report: dict = response.json()["data"]
+        assert report["created"] == 2
+        assert [error["ref"] for error in report["errors"]] == ["lost", "late"]
+        assert report["errors"][1]["detail"] == (
+            "You can't create a folder with the same name which you already have"
+        )
+        assert set(
+            await db_test.scalars(
+                select(Folder.name).filter(Folder.name.in_(["Imported same", "Imported parent"]))
+            )
+        ) == {"Imported same", "Imported parent"}
+
+
+    @pytest.mark.asyncio
+    async def test_import_folders_limits(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            db_test: AsyncSession,
+            monkeypatch
+    ) -> None:
+        """Test files with too many lines or too many lines waiting
+        for their parents are rejected and nothing is created"""
+
+        monkeypatch.setattr(folder_import, "FOLDERS_IMPORT_MAX_LINES", 3)
+        monkeypatch.setattr(folder_import, "FOLDERS_IMPORT_MAX_WAITING", 1)
+        too_long: list[dict] = [{"ref": f"root{number}", "name": f"Imported {number}"} for number in range(4)]
+        response = await async_folder_client.post(
+            url="/import", content="\n".join(json.dumps(line) for line in too_long).encode()
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert response.json()["detail"] == "You can't import more than 3 folders at once"
+
+        waiting: list[dict] = [
+            {"ref": "child1", "parent_ref": "root", "name": "Imported child1"},
+            {"ref": "child2", "parent_ref": "root", "name": "Imported child2"},
+            {"ref": "root", "name": "Imported root"},
+        ]
+        response = await async_folder_client.post(
+            url="/import", content="\n".join(json.dumps(line) for line in waiting).encode()
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert response.json()["detail"].startswith("More than 1 folders wait for parents")
+        assert await db_test.scalar(select(Folder).filter(Folder.name.startswith("Imported"))) is None
@@ -36,4 +36,63 @@ class TestListFolder:
         json_data: dict = response.json()
         assert json_data["detail"] == "Successful"
         assert isinstance(json_data["data"], list)
-        assert len(json_data["data"]) == 3
\ No newline at end of file
+        assert len(json_data["data"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_list_folders_pagination(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            folders: list[Folder]
+    ) -> None:
+        """Test walking through the folders page by page"""
+
+        response = await async_folder_client.get(url="/", params={"limit": 2})
+        assert response.status_code == status.HTTP_200_OK
+        json_data: dict = response.json()
+        assert len(json_data["data"]) == 2
+        assert json_data["next_cursor"]
+
+        response = await async_folder_client.get(
+            url="/", params={"limit": 2, "cursor": json_data["next_cursor"]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        next_json_data: dict = response.json()
+        assert len(next_json_data["data"]) == 1
+        assert next_json_data["next_cursor"] is None
+        listed_ids: set = {
+            folder["id"] for folder in json_data["data"] + next_json_data["data"]
+        }
+        assert len(listed_ids) == 3
+
+
+    @pytest.mark.asyncio
+    async def test_list_folders_filter_by_parent_id(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            user_folder: Folder,
+            user_nested_folder: Folder
+    ) -> None:
+        """Test response filtered by a parent folder"""
+
+        response = await async_folder_client.get(
+            url="/", params={"parent_id": str(user_folder.id)}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        json_data: dict = response.json()
+        assert [folder["id"] for folder in json_data["data"]] == [str(user_nested_folder.id)]
+
+
+    @pytest.mark.asyncio
+    async def test_list_folders_invalid_cursor(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            folders: list[Folder]
+    ) -> None:
+        """Test response with a broken cursor"""
+
+        response = await async_folder_client.get(url="/", params={"cursor": "broken"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,94 @@
+import pytest
+from httpx import AsyncClient
+from starlette import status
+
+from app.todo.folder.model import Folder
+
+
+class TestShowFolderTree:
+    """Test a route for showing a folder with its nested folders"""
+
+    @pytest.mark.asyncio
+    async def test_show_folder_tree_not_auth(
+            self,
+            async_folder_client: AsyncClient,
+            user_folder_url: str
+    ) -> None:
+        """Test response with not auth data"""
+
+        response = await async_folder_client.get(url=user_folder_url + "/tree")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Not authenticated"
+
+
+    @pytest.mark.asyncio
+    async def test_show_folder_tree_positive(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            user_folder_url: str,
+            user_folder: Folder,
+            user_nested_folder: Folder,
+            user_nested_nested_folder: Folder
+    ) -> None:
+        """Test response with a positive test case"""
+
+        response = await async_folder_client.get(url=user_folder_url + "/tree")
+        assert response.status_code == status.HTTP_200_OK
+        json_data: dict = response.json()
+        assert json_data["detail"] == "Successful"
+        root: dict = json_data["data"]
+        assert root["id"] == str(user_folder.id)
+        assert [child["id"] for child in root["children"]] == [str(user_nested_folder.id)]
+        nested: dict = root["children"][0]
+        assert [child["id"] for child in nested["children"]] == [str(user_nested_nested_folder.id)]
+        assert nested["children"][0]["children"] == []
+
+
+    @pytest.mark.asyncio
+    async def test_show_folder_tree_max_depth(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            user_folder_url: str,
+            user_nested_folder: Folder
+    ) -> None:
+        """Test response limited by max_depth"""
+
+        response = await async_folder_client.get(
+            url=user_folder_url + "/tree", params={"max_depth": 1}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        root: dict = response.json()["data"]
+        assert [child["id"] for child in root["children"]] == [str(user_nested_folder.id)]
+        assert root["children"][0]["children"] == []
+
+
+    @pytest.mark.asyncio
+    async def test_show_folder_tree_private_folder(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            admin_folder_url: str,
+            admin_folder: Folder
+    ) -> None:
+        """Test response with a user trying to see other user's private folder tree"""
+
+        assert admin_folder.is_private
+        response = await async_folder_client.get(url=admin_folder_url + "/tree")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "You can't see a private folder of other user"
+
+
+    @pytest.mark.asyncio
+    async def test_show_folder_tree_not_exist(
+            self,
+            async_folder_client: AsyncClient,
+            mock_get_current_user_1,
+            fake_uuid: str
+    ) -> None:
+        """Test response with not exist folder"""
+
+        response = await async_folder_client.get(url=f"/{fake_uuid}/tree")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "A folder with given id doesn't exist"
@@ -1,11 +1,19 @@
+import asyncio
+
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.auth.auth_router import get_current_user
+from app.auth.model import User
+from app.backend.db import async_session_maker
 from app.main import app
 from app.todo.folder.model import Folder
+from app.todo.folder.schema import UpdateFolder
+from app.todo.folder.service import FolderManager
 
 
 class TestUpdateFolder:
@@ -163,3 +171,114 @@ class TestUpdateFolder:
         await db_test.refresh(user_nested_nested_folder)
         assert user_nested_nested_folder.parent_id == user_nested_folder.id
         assert user_nested_nested_folder.name == "Nested Nested User Folder"
+
+
+    @pytest.mark.asyncio
+    async def test_update_folder_positive_moves_children_paths(
+            self,
+            async_folder_client: AsyncClient,
+            user_nested_folder_url: str,
+            mock_get_current_user_1,
+            db_test: AsyncSession,
+            folder_data: dict,
+            user_1: User,
+            user_nested_folder: Folder,
+            user_nested_nested_folder: Folder
+    ) -> None:
+        """Test materialized paths of a moved folder and its children"""
+
+        new_parent: Folder = Folder(**folder_data, user_id=user_1.id)
+        db_test.add(new_parent)
+        await db_test.commit()
+
+        response = await async_folder_client.put(
+            url=user_nested_folder_url, json={"parent_id": str(new_parent.id)}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        await db_test.refresh(user_nested_folder)
+        await db_test.refresh(user_nested_nested_folder)
+        assert user_nested_folder.path == Folder.build_path(new_parent.path, user_nested_folder.id)
+        assert user_nested_nested_folder.path == Folder.build_path(
+            user_nested_folder.path, user_nested_nested_folder.id
+        )
+
+
+    @pytest.mark.asyncio
+    async def test_update_folder_move_inside_itself(
+            self,
+            async_folder_client: AsyncClient,
+            user_folder_url: str,
+            mock_get_current_user_1,
+            db_test: AsyncSession,
+            user_folder: Folder,
+            user_nested_nested_folder: Folder
+    ) -> None:
+        """Test response with moving a folder inside of its own child"""
+
+        response = await async_folder_client.put(
+            url=user_folder_url, json={"parent_id": str(user_nested_nested_folder.id)}
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "You can't move a folder inside of itself"
+
+        await db_test.refresh(user_folder)
+        assert user_folder.parent_id is None
+
+
+    @pytest.mark.asyncio
+    async def test_update_folder_partial_update(
+            self,
+            async_folder_client: AsyncClient,
+            user_folder_url: str,
+            mock_get_current_user_1,
+            db_test: AsyncSession,
+            user_folder: Folder
+    ) -> None:
+        """Test only the sent fields are updated, including false and null values"""
+
+        old_name: str = user_folder.name
+        response = await async_folder_client.put(
+            url=user_folder_url, json={"is_active": False, "description": None}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["is_active"] is False
+
+        await db_test.refresh(user_folder)
+        assert user_folder.is_active is False
+        assert user_folder.description is None
+        assert user_folder.name == old_name
+
+
+    @pytest.mark.asyncio
+    async def test_update_folder_concurrent_moves_make_no_cycle(
+            self,
+            user_1: User,
+            db_test: AsyncSession
+    ) -> None:
+        """Test moving A under B and B under A at once moves only one of them"""
+
+        first, second = Folder(name="First Folder", user_id=user_1.id), Folder(name="Second Folder", user_id=user_1.id)
+        db_test.add_all([first, second])
+        await db_test.commit()
+        get_user: dict = {"id": str(user_1.id), "username": user_1.username, "is_superuser": False}
+
+        async def move(folder: Folder, parent: Folder):
+            async with async_session_maker() as db:
+                return await FolderManager.update_folder(
+                    db=db, folder_id=folder.id, get_user=get_user,
+                    updated_data=UpdateFolder(parent_id=parent.id)
+                )
+
+        results = await asyncio.gather(move(first, second), move(second, first), return_exceptions=True)
+        errors: list[HTTPException] = [result for result in results if isinstance(result, HTTPException)]
+        assert len(errors) == 1
+        assert errors[0].detail == "You can't move a folder inside of itself"
+
+        paths: dict[str, str] = {
+            row.name: row.path
+            for row in await db_test.execute(
+                select(Folder.name, Folder.path).filter(Folder.id.in_([first.id, second.id]))
+            )
+        }
+        assert sorted(path.count("/") for path in paths.values()) == [2, 3]
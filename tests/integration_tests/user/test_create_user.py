@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from app.auth.hashing import password_hasher
 from app.auth.model import User
 
 
@@ -63,3 +64,22 @@ class TestCreateUser:
         response = await async_user_client.post(url="/", json=user_data)
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert response.json()["detail"] == "This email is already taken"
+
+
+    @pytest.mark.asyncio
+    async def test_create_user_password_hasher_is_busy(
+            self,
+            async_user_client: AsyncClient,
+            db_test: AsyncSession,
+            user_data: dict,
+            monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test response when the password hashing pool is saturated"""
+
+        monkeypatch.setattr(password_hasher, "max_pending", 0)
+        response = await async_user_client.post(url="/", json=user_data)
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["detail"] == "Server is busy, try again later"
+        assert await db_test.scalar(
+            select(User).filter_by(username=user_data["username"])
+        ) is None
@@ -0,0 +1,153 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.auth.hashing import bcrypt_context
+from app.auth.model import User
+from app.backend.streaming import MAX_LINE_LENGTH
+
+
+class TestImportUsers:
+    """Test a route for creating users from a CSV or NDJSON body"""
+
+    @pytest.mark.asyncio
+    async def test_import_users_by_user(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_user_1,
+    ) -> None:
+        """Test response with not admin account"""
+
+        response = await async_user_client.post(url="/import", content=b"")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "You don't have admin permission"
+
+
+    @pytest.mark.asyncio
+    async def test_import_users_csv(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_admin_1,
+            user_1: User,
+            db_test: AsyncSession
+    ) -> None:
+        """Test created users and errors of duplicates and invalid rows"""
+
+        content: bytes = (
+            b"username,email,raw_password,fullname\n"
+            b"importuser1,importuser1@mail.run,Password1!,\"Import, First\"\n"
+            b"testtest1,importuser2@mail.run,Password1!,\n"
+            b"importuser3,importuser1@mail.run,Password1!,\n"
+            b"importuser4,not-an-email,Password1!,\n"
+            b"importuser5,importuser5@mail.run,Password1!\n"
+        )
+        response = await async_user_client.post(url="/import?format=csv", content=content)
+        assert response.status_code == status.HTTP_200_OK
+        report: dict = response.json()["data"]
+        assert report["total"] == 5
+        assert report["created"] == 1
+        errors: dict[int, str] = {error["line"]: error["detail"] for error in report["errors"]}
+        assert errors[3] == "This username is already taken"
+        assert errors[4] == "This email is repeated in the file"
+        assert errors[5].startswith("email")
+        assert errors[6] == "Expected 4 values, got 3"
+
+        user: User = await db_test.scalar(select(User).filter_by(username="importuser1"))
+        assert user.fullname == "Import, First"
+        assert user.is_active and not user.is_superuser
+        assert bcrypt_context.verify("Password1!", user.password)
+
+
+    @pytest.mark.asyncio
+    async def test_import_users_ndjson(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_admin_1,
+            db_test: AsyncSession
+    ) -> None:
+        """Test created users of NDJSON lines sent by chunks"""
+
+        async def chunks():
+            yield b'{"username": "importuser1", "email": "importuser1@mail.run", "raw_pass'
+            yield b'word": "Password1!"}\n{"username": "importuser2", '
+            yield b'"email": "importuser2@mail.run", "raw_password": "Password1!"}\nnot json\n'
+
+        response = await async_user_client.post(url="/import", content=chunks())
+        report: dict = response.json()["data"]
+        assert report["total"] == 3
+        assert report["created"] == 2
+        assert report["errors"] == [{"line": 3, "detail": "Invalid JSON"}]
+        assert set(
+            await db_test.scalars(
+                select(User.username).where(User.username.in_(["importuser1", "importuser2"]))
+            )
+        ) == {"importuser1", "importuser2"}
+
+
+    @pytest.mark.asyncio
+    async def test_import_users_not_utf8(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_admin_1,
+            db_test: AsyncSession
+    ) -> None:
+        """Test a Latin-1 CSV is rejected with the line number and nothing is created"""
+
+        content: bytes = (
+            "username,email,raw_password,fullname\n"
+            "importuser1,importuser1@mail.run,Password1!,\n"
+            "importuser2,importuser2@mail.run,Password1!,José\n"
+        ).encode("latin-1")
+        response = await async_user_client.post(url="/import?format=csv", content=content)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"] == "Line 3 isn't valid UTF-8"
+        assert await db_test.scalar(select(User).filter_by(username="importuser1")) is None
+
+
+    @pytest.mark.asyncio
+    async def test_import_users_line_too_long(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_admin_1,
+    ) -> None:
+        """Test a body without line breaks isn't buffered past the line limit"""
+
+        content: bytes = b"username,email,raw_password,fullname\n" + b"x" * (MAX_LINE_LENGTH + 1)
+        response = await async_user_client.post(url="/import?format=csv", content=content)
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert response.json()["detail"] == f"Line 2 is longer than {MAX_LINE_LENGTH} bytes"
+
+
+    @pytest.mark.asyncio
+    async def test_import_users_invalid_first_copy(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_admin_1,
+            user_1: User,
+            db_test: AsyncSession
+    ) -> None:
+        """Test a line repeating an invalid earlier line is created"""
+
+        content: bytes = (
+            b"username,email,raw_password,fullname\n"
+            b"importuser1,importuser1@mail.run,Password1!," + b"x" * 250 + b"\n"
+            b"importuser1,importuser1@mail.run,Password1!,\n"
+            b"testtest1,importuser3@mail.run,Password1!,\n"
+            b"importuser3,importuser3@mail.run,Password1!,\n"
+        )
+        response = await async_user_client.post(url="/import?format=csv", content=content)
+        assert response.status_code == status.HTTP_200_OK
+        report: dict = response.json()["data"]
+        assert report["created"] == 2
+        errors: dict[int, str] = {error["line"]: error["detail"] for error in report["errors"]}
+        assert errors == {
+            2: "fullname: String should have at most 200 characters",
+            4: "This username is already taken",
+        }
+        assert set(
+            await db_test.scalars(
+                select(User.username).where(User.username.in_(["importuser1", "importuser3"]))
+            )
+        ) == {"importuser1", "importuser3"}
@@ -0,0 +1,92 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette import status
+
+from app.auth.model import User
+from app.auth.user_cache import user_cache
+from app.backend import db_depends
+from app.backend.config import settings
+from app.backend.read_routing import primary_stickiness
+
+
+@pytest_asyncio.fixture
+async def read_engine(monkeypatch) -> AsyncEngine:
+    """A separate read-only engine of the test DB standing for a replica"""
+
+    engine: AsyncEngine = create_async_engine(
+        url=settings.DATABASE_URL_async, execution_options={"postgresql_readonly": True}
+    )
+    monkeypatch.setattr(db_depends, "async_read_engine", engine)
+    monkeypatch.setattr(
+        db_depends, "async_read_session_maker",
+        async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession, info={"replica": True})
+    )
+    yield engine
+    await engine.dispose()
+
+
+class TestReadRouting:
+    """Test routing of read routes between the read engine and the primary"""
+
+    @pytest.mark.asyncio
+    async def test_reads_stick_to_primary_after_write(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_user_1,
+            read_engine: AsyncEngine,
+            user_1: User,
+            user_1_url: str,
+            updated_fields: dict
+    ) -> None:
+        """Test a read from the read engine, then reads from the primary
+        within the sticky window after the client has written"""
+
+        replica_reads, primary_reads = primary_stickiness.replica_reads, primary_stickiness.primary_reads
+        response = await async_user_client.get(url=user_1_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert primary_stickiness.replica_reads == replica_reads + 1
+        assert primary_stickiness.primary_reads == primary_reads
+
+        response = await async_user_client.put(url=user_1_url, json=updated_fields)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await async_user_client.get(url=f"/{updated_fields['username']}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["fullname"] == updated_fields["fullname"]
+        assert primary_stickiness.replica_reads == replica_reads + 1
+        assert primary_stickiness.primary_reads == primary_reads + 1
+
+
+    @pytest.mark.asyncio
+    async def test_replica_read_isnt_cached(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_user_1,
+            read_engine: AsyncEngine,
+            user_1: User,
+            user_1_url: str,
+            updated_fields: dict
+    ) -> None:
+        """Test a replica read between the writer's PUT and GET doesn't fill
+        the user cache, so the writer reads its update from the primary"""
+
+        response = await async_user_client.put(url=user_1_url, json=updated_fields)
+        assert response.status_code == status.HTTP_200_OK
+        writer_cookies = dict(async_user_client.cookies)
+
+        async_user_client.cookies.clear()
+        replica_reads: int = primary_stickiness.replica_reads
+        response = await async_user_client.get(url=f"/{updated_fields['username']}")
+        assert response.status_code == status.HTTP_200_OK
+        assert primary_stickiness.replica_reads == replica_reads + 1
+        assert await user_cache.get(updated_fields["username"]) is None
+
+        async_user_client.cookies.update(writer_cookies)
+        primary_reads: int = primary_stickiness.primary_reads
+        response = await async_user_client.get(url=f"/{updated_fields['username']}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["fullname"] == updated_fields["fullname"]
+        assert primary_stickiness.primary_reads == primary_reads + 1
+        assert (await user_cache.get(updated_fields["username"])).fullname == updated_fields["fullname"]
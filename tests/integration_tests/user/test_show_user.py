@@ -72,4 +72,20 @@ class TestShowUser:
         user_data: dict = response.json()
         assert user_data["detail"] == "Successful"
         assert user_data["data"]["username"] == user_1.username
-        assert user_data["data"]["email"] == user_1.email
\ No newline at end of file
+        assert user_data["data"]["email"] == user_1.email
+
+    @pytest.mark.asyncio
+    async def test_show_user_server_timing(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_user_1,
+            user_1,
+            user_1_url
+    ) -> None:
+        """Test a response has the request's DB usage in a Server-Timing header"""
+
+        response = await async_user_client.get(url=user_1_url)
+        assert response.status_code == status.HTTP_200_OK
+        server_timing: str = response.headers["server-timing"]
+        assert 'desc="1 queries"' in server_timing
+        assert "total;dur=" in server_timing
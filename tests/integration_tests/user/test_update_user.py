@@ -63,6 +63,28 @@ class TestUpdateUser:
         assert user_1.fullname == updated_fields["fullname"]
         assert user_1.username == updated_fields["username"]
 
+
+    @pytest.mark.asyncio
+    async def test_update_user_invalidates_cached_user(
+            self,
+            async_user_client: AsyncClient,
+            user_1_url: str,
+            updated_fields: dict,
+            mock_get_current_user_1,
+            user_1: User
+    ) -> None:
+        """Test a cached user is shown with updated data after an update"""
+
+        old_username: str = user_1.username
+        assert (await async_user_client.get(url=f"/{old_username}")).status_code == status.HTTP_200_OK
+        response = await async_user_client.put(url=user_1_url, json=updated_fields)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await async_user_client.get(url=user_1_url)
+        assert response.json()["data"]["fullname"] == updated_fields["fullname"]
+        response = await async_user_client.get(url=f"/{old_username}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     @pytest.mark.asyncio
     async def test_update_user_other_user_by_user(
             self,
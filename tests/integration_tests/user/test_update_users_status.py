@@ -0,0 +1,130 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.auth import service
+from app.auth.model import User
+
+
+class TestUpdateUsersStatus:
+    """Test a route for deactivating and reactivating users at once"""
+
+    @pytest.mark.asyncio
+    async def test_update_users_status_by_user(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_user_1,
+            user_2: User,
+            db_test: AsyncSession
+    ) -> None:
+        """Test response with not admin account"""
+
+        response = await async_user_client.post(
+            url="/status", json={"is_active": False, "ids": [str(user_2.id)]}
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "You don't have admin permission"
+        await db_test.refresh(user_2)
+        assert user_2.is_active
+
+
+    @pytest.mark.asyncio
+    async def test_update_users_status_by_ids(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_admin_1,
+            user_1: User,
+            user_2: User,
+            admin_1: User,
+            admin_2: User,
+            fake_uuid: str,
+            db_test: AsyncSession
+    ) -> None:
+        """Test results of every given id with deactivated users"""
+
+        response = await async_user_client.post(
+            url="/status",
+            json={
+                "is_active": False,
+                "ids": [
+                    str(user_1.id), str(user_2.id), str(admin_2.id), fake_uuid, str(user_1.id), str(admin_1.id)
+                ]
+            }
+        )
+        assert response.status_code == status.HTTP_200_OK
+        results: dict[str, dict] = {result["user_id"]: result for result in response.json()["data"]}
+        assert len(results) == 5
+        assert results[str(user_1.id)]["status_code"] == status.HTTP_200_OK
+        assert results[str(user_2.id)]["status_code"] == status.HTTP_200_OK
+        assert results[str(admin_2.id)]["detail"] == "You can't deactivate other admin's data"
+        assert results[fake_uuid]["status_code"] == status.HTTP_404_NOT_FOUND
+        assert results[str(admin_1.id)]["detail"] == "You can't deactivate your own account in bulk"
+
+        for user in (user_1, user_2, admin_1, admin_2):
+            await db_test.refresh(user)
+        assert not user_1.is_active and not user_2.is_active
+        assert admin_1.is_active and admin_2.is_active
+
+        response = await async_user_client.post(
+            url="/status", json={"is_active": False, "ids": [str(user_1.id)]}
+        )
+        assert response.json()["data"][0]["detail"] == "User already has been deleted"
+
+
+    @pytest.mark.asyncio
+    async def test_update_users_status_by_filter(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_admin_1,
+            user_1: User,
+            user_2: User,
+            admin_1: User,
+            admin_2: User,
+            db_test: AsyncSession
+    ) -> None:
+        """Test deactivation and reactivation of users by an email domain,
+        admins including the acting one are skipped"""
+
+        response = await async_user_client.post(
+            url="/status", json={"is_active": False, "filter": {"email_domain": "mail.run"}}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert {result["user_id"] for result in response.json()["data"]} == {
+            str(user_1.id), str(user_2.id)
+        }
+        for admin in (admin_1, admin_2):
+            await db_test.refresh(admin)
+            assert admin.is_active
+
+        response = await async_user_client.post(
+            url="/status", json={"is_active": True, "filter": {"email_domain": "mail.run"}}
+        )
+        assert len(response.json()["data"]) == 2
+        for user in (user_1, user_2, admin_1, admin_2):
+            await db_test.refresh(user)
+            assert user.is_active
+
+
+    @pytest.mark.asyncio
+    async def test_update_users_status_by_filter_is_capped(
+            self,
+            async_user_client: AsyncClient,
+            mock_get_current_admin_1,
+            user_1: User,
+            user_2: User,
+            monkeypatch
+    ) -> None:
+        """Test a filter updates at most USERS_STATUS_MAX_IDS users per request
+        and a repeated request goes on with the rest"""
+
+        monkeypatch.setattr(service, "USERS_STATUS_MAX_IDS", 1)
+        updated_ids: set[str] = set()
+        for _ in range(2):
+            response = await async_user_client.post(
+                url="/status", json={"is_active": False, "filter": {"email_domain": "mail.run"}}
+            )
+            data: list[dict] = response.json()["data"]
+            assert len(data) == 1
+            updated_ids.add(data[0]["user_id"])
+        assert updated_ids == {str(user_1.id), str(user_2.id)}
@@ -0,0 +1,10 @@
+import pytest_asyncio
+
+from app.auth.token_cache import token_cache
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def async_setup() -> None:
+    """Unit tests don't touch the DB, only the process caches are reset"""
+
+    token_cache.clear()
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from app import launcher
+from app.backend.config import Settings, settings
+from app.launcher import APP_IMPORT_STRING, configure_worker_pools, get_uvicorn_options, get_worker_pool_size
+
+
+@pytest.fixture
+def environ(monkeypatch) -> dict:
+    environ: dict = dict(os.environ)
+    monkeypatch.setattr(os, "environ", environ)
+    return environ
+
+
+class TestWorkerPools:
+    """Test pools of all workers fit in DB_MAX_CONNECTIONS"""
+
+    def test_pool_split_between_engines(self) -> None:
+        assert get_worker_pool_size(10, 10, workers=4, max_connections=85, reserved=5) == (10, 10)
+        assert get_worker_pool_size(10, 10, workers=4, max_connections=85, reserved=5, engines=2) == (10, 0)
+        with pytest.raises(SystemExit):
+            get_worker_pool_size(10, 10, workers=4, max_connections=12, reserved=5, engines=2)
+
+    @pytest.mark.parametrize(
+        "read_path, pool_size",
+        [(None, 20), ("SQL_PATH", 10), ("//root:p@replica:5432/test", 20)]
+    )
+    def test_read_pool_on_primary_server(self, environ: dict, read_path: str | None, pool_size: int) -> None:
+        config = settings.model_copy(update={
+            "SQL_READ_PATH": settings.SQL_PATH if read_path == "SQL_PATH" else read_path,
+            "DB_MAX_CONNECTIONS": 45,
+            "DB_RESERVED_CONNECTIONS": 5,
+            "DB_POOL_SIZE": 30,
+            "DB_MAX_OVERFLOW": 10,
+        })
+        configure_worker_pools(config, workers=2)
+        assert (config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW) == (pool_size, 0)
+
+
+    def test_pool_size_exported_to_workers(self, environ: dict) -> None:
+        """Test a worker process which builds its settings from the environment gets the shrunk pool"""
+
+        config = settings.model_copy(update={
+            "SQL_READ_PATH": None, "DB_MAX_CONNECTIONS": 45, "DB_RESERVED_CONNECTIONS": 5,
+            "DB_POOL_SIZE": 30, "DB_MAX_OVERFLOW": 10,
+        })
+        configure_worker_pools(config, workers=4)
+        assert (environ["DB_POOL_SIZE"], environ["DB_MAX_OVERFLOW"]) == ("10", "0")
+        worker_options: dict = Settings().db_engine_options
+        assert (worker_options["pool_size"], worker_options["max_overflow"]) == (10, 0)
+
+
+    def test_no_max_connections_keeps_environment(self, environ: dict) -> None:
+        environ.pop("DB_POOL_SIZE", None)
+        configure_worker_pools(settings.model_copy(update={"DB_MAX_CONNECTIONS": None}), workers=4)
+        assert "DB_POOL_SIZE" not in environ
+
+
+class TestUvicornOptions:
+    """Test uvicorn options assembled from the SERVER_* settings"""
+
+    def test_options_of_settings(self, monkeypatch) -> None:
+        monkeypatch.setattr(launcher.importlib.util, "find_spec", lambda name: None)
+        config = settings.model_copy(update={
+            "SERVER_HOST": "127.0.0.1", "SERVER_PORT": 9000, "SERVER_WORKERS": 3,
+            "SERVER_LOOP": "auto", "SERVER_HTTP": "httptools", "SERVER_RELOAD": False,
+            "SERVER_KEEPALIVE": 7, "SERVER_BACKLOG": 512, "SERVER_GRACEFUL_SHUTDOWN": 10,
+        })
+        assert get_uvicorn_options(config) == {
+            "host": "127.0.0.1",
+            "port": 9000,
+            "workers": 3,
+            "loop": "asyncio",
+            "http": "httptools",
+            "reload": False,
+            "timeout_keep_alive": 7,
+            "backlog": 512,
+            "timeout_graceful_shutdown": 10,
+        }
+
+
+    def test_workers(self, monkeypatch) -> None:
+        monkeypatch.setattr(launcher.os, "cpu_count", lambda: 6)
+        assert get_uvicorn_options(settings.model_copy(update={"SERVER_WORKERS": None}))["workers"] == 6
+        reload_options: dict = get_uvicorn_options(
+            settings.model_copy(update={"SERVER_WORKERS": 4, "SERVER_RELOAD": True})
+        )
+        assert (reload_options["workers"], reload_options["reload"]) == (1, True)
+
+
+    def test_main_runs_uvicorn_with_exported_pools(self, monkeypatch, environ: dict) -> None:
+        runs: list[tuple[str, dict]] = []
+        monkeypatch.setattr(launcher.uvicorn, "run", lambda app, **options: runs.append((app, options)))
+        monkeypatch.setattr(launcher, "settings", settings.model_copy(update={
+            "SQL_READ_PATH": None, "DB_MAX_CONNECTIONS": 25, "DB_RESERVED_CONNECTIONS": 5,
+            "DB_POOL_SIZE": 30, "DB_MAX_OVERFLOW": 10, "SERVER_RELOAD": False,
+        }))
+        launcher.main(["--workers", "2", "--port", "9001"])
+        [(app, options)] = runs
+        assert app == APP_IMPORT_STRING
+        assert (options["workers"], options["port"]) == (2, 9001)
+        assert (environ["DB_POOL_SIZE"], environ["DB_MAX_OVERFLOW"]) == ("10", "0")
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+from starlette.routing import Mount, Route
+
+from app.backend.loop_monitor import UNKNOWN_ROUTE, EventLoopWatchdog, get_endpoint_routes
+
+THRESHOLD: float = 0.1
+
+
+def blocking_endpoint() -> None:
+    time.sleep(THRESHOLD * 4)
+
+
+def other_endpoint() -> None:
+    pass
+
+
+class TestEventLoopWatchdog:
+    """Test the watchdog thread reports a blocked loop with the route and the stack"""
+
+    def test_endpoint_routes_of_mounts(self) -> None:
+        routes = [Route("/other", other_endpoint), Mount("/api", routes=[Route("/blocking", blocking_endpoint)])]
+        assert get_endpoint_routes(routes) == {
+            other_endpoint.__code__: "/other",
+            blocking_endpoint.__code__: "/api/blocking",
+        }
+
+
+    @pytest.mark.asyncio
+    async def test_blocked_loop_is_reported(self, caplog) -> None:
+        watchdog = EventLoopWatchdog(threshold=THRESHOLD)
+        watchdog.start(routes=[Route("/blocking", blocking_endpoint), Route("/other", other_endpoint)])
+        thread: threading.Thread = watchdog._thread
+        assert thread.is_alive()
+        with caplog.at_level(logging.WARNING, logger="app.backend.loop_monitor"):
+            await asyncio.sleep(THRESHOLD)
+            blocking_endpoint()
+            await asyncio.sleep(THRESHOLD)
+        await watchdog.stop()
+
+        assert watchdog.stalls == 1
+        assert watchdog.route_stalls == {"/blocking": 1}
+        assert watchdog.max_stall >= THRESHOLD
+        [record] = [record for record in caplog.records if "Event loop is blocked" in record.getMessage()]
+        assert "by route /blocking" in record.getMessage()
+        assert "in blocking_endpoint" in record.getMessage()
+        assert not thread.is_alive() and watchdog._thread is None
+
+
+    @pytest.mark.asyncio
+    async def test_block_outside_routes(self) -> None:
+        watchdog = EventLoopWatchdog(threshold=THRESHOLD)
+        watchdog.start(routes=[Route("/other", other_endpoint)])
+        time.sleep(THRESHOLD * 4)
+        await asyncio.sleep(THRESHOLD)
+        await watchdog.stop()
+        assert watchdog.route_stalls == {UNKNOWN_ROUTE: 1}
+
+
+    @pytest.mark.asyncio
+    async def test_stop_without_stall(self) -> None:
+        watchdog = EventLoopWatchdog(threshold=THRESHOLD)
+        watchdog.start()
+        thread: threading.Thread = watchdog._thread
+        await asyncio.sleep(THRESHOLD * 2)
+        await watchdog.stop()
+        assert watchdog.stalls == 0
+        assert not thread.is_alive()
+        await watchdog.stop()
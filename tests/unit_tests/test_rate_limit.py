@@ -0,0 +1,93 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette import status
+from starlette.responses import PlainTextResponse
+
+from app.backend import rate_limit
+from app.backend.rate_limit import InMemoryRateLimitStorage, RateLimit, RateLimitMiddleware
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake_clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+async def _ok_app(scope, receive, send) -> None:
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def _client(limits: dict[str, str]) -> AsyncClient:
+    app = RateLimitMiddleware(_ok_app, limits=limits, storage=InMemoryRateLimitStorage())
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestRateLimit:
+    """Test token buckets and the rate limiting middleware"""
+
+    def test_parse(self) -> None:
+        assert RateLimit.parse("10/minute") == RateLimit(capacity=10, period=60.0)
+        assert RateLimit.parse("5/ second") == RateLimit(capacity=5, period=1.0)
+        assert RateLimit.parse("120/hour").refill_rate == pytest.approx(120 / 3600)
+        with pytest.raises(KeyError):
+            RateLimit.parse("5/week")
+
+
+    @pytest.mark.asyncio
+    async def test_bucket_refill(self, clock: FakeClock) -> None:
+        storage = InMemoryRateLimitStorage()
+        limit: RateLimit = RateLimit.parse("2/minute")
+        assert await storage.consume("key", limit) == 0
+        assert await storage.consume("key", limit) == 0
+        assert await storage.consume("key", limit) == pytest.approx(30)
+
+        clock.now += 15
+        assert await storage.consume("key", limit) == pytest.approx(15)
+        clock.now += 15
+        assert await storage.consume("key", limit) == 0
+        assert await storage.consume("other_key", limit) == 0
+
+        clock.now += 3600
+        assert await storage.consume("key", limit) == 0
+        assert await storage.consume("key", limit) == 0
+        assert await storage.consume("key", limit) > 0
+
+
+    @pytest.mark.asyncio
+    async def test_too_many_requests(self, clock: FakeClock) -> None:
+        """Test 429 with Retry-After and the stricter bucket of /auth/token"""
+
+        async with _client({"default": "3/minute", "/auth/token": "1/minute"}) as client:
+            assert (await client.post("/auth/token")).status_code == status.HTTP_200_OK
+            response = await client.post("/auth/token")
+            assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+            assert response.headers["Retry-After"] == "60"
+            assert response.json()["detail"] == "Too many requests"
+
+            for _ in range(3):
+                assert (await client.get("/api/v1/folders/")).status_code == status.HTTP_200_OK
+            response = await client.get("/api/v1/folders/")
+            assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+            assert response.headers["Retry-After"] == "20"
+
+
+    def test_prefix_matches_path_segments(self) -> None:
+        middleware = RateLimitMiddleware(
+            _ok_app,
+            limits={"default": "3/minute", "/auth/token": "1/minute", "/api/v1/": "2/minute"},
+            storage=InMemoryRateLimitStorage()
+        )
+        assert middleware._get_limit("/auth/token")[0] == "/auth/token"
+        assert middleware._get_limit("/auth/token/refresh")[0] == "/auth/token"
+        assert middleware._get_limit("/auth/tokenfoo")[0] == "default"
+        assert middleware._get_limit("/api/v1/users/")[0] == "/api/v1/"
+        assert middleware._get_limit("/api/v1")[0] == "/api/v1/"
@@ -0,0 +1,83 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from app.backend import read_routing
+from app.backend.read_routing import (
+    READ_PRIMARY_COOKIE,
+    READ_PRIMARY_HEADER,
+    PrimaryStickiness,
+    PrimaryStickinessMiddleware,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake_clock = FakeClock()
+    monkeypatch.setattr(read_routing.time, "time", fake_clock)
+    return fake_clock
+
+
+def _client(stickiness: PrimaryStickiness) -> AsyncClient:
+    async def app(scope, receive, send) -> None:
+        request = Request(scope, receive)
+        if request.method == "POST":
+            stickiness.mark_write(request)
+            response = PlainTextResponse("written")
+        else:
+            response = PlainTextResponse(
+                "primary" if stickiness.reads_from_primary(request) else "replica"
+            )
+        await response(scope, receive, send)
+
+    transport = ASGITransport(app=PrimaryStickinessMiddleware(app, stickiness=stickiness))
+    return AsyncClient(transport=transport, base_url="http://test")
+
+
+class TestPrimaryStickiness:
+    """Test reads routed to the primary by the signed deadline of a write"""
+
+    @pytest.mark.asyncio
+    async def test_cookie_sticks_until_window_passes(self, clock: FakeClock) -> None:
+        async with _client(PrimaryStickiness(window=5, secret_key="secret")) as client:
+            assert (await client.get("/")).text == "replica"
+            response = await client.post("/")
+            assert READ_PRIMARY_COOKIE in response.cookies
+            assert (await client.get("/")).text == "primary"
+            clock.now += 5
+            assert (await client.get("/")).text == "replica"
+
+    @pytest.mark.asyncio
+    async def test_header_is_shared_by_workers(self, clock: FakeClock) -> None:
+        """Test a deadline issued by one worker is accepted by other one"""
+
+        async with _client(PrimaryStickiness(window=5, secret_key="secret")) as writer:
+            value: str = (await writer.post("/")).headers[READ_PRIMARY_HEADER]
+        async with _client(PrimaryStickiness(window=5, secret_key="secret")) as reader:
+            assert (await reader.get("/", headers={READ_PRIMARY_HEADER: value})).text == "primary"
+
+    @pytest.mark.asyncio
+    async def test_forged_deadline_reads_from_replica(self, clock: FakeClock) -> None:
+        stickiness = PrimaryStickiness(window=5, secret_key="secret")
+        value: str = PrimaryStickiness(window=3600, secret_key="other").issue()
+        deadline, _, signature = stickiness.issue().rpartition(".")
+        async with _client(stickiness) as client:
+            for forged in (value, f"{float(deadline) + 3600}.{signature}", "garbage"):
+                assert (await client.get("/", headers={READ_PRIMARY_HEADER: forged})).text == "replica"
+        assert stickiness.replica_reads == 3
+
+    @pytest.mark.asyncio
+    async def test_no_window_no_cookie(self, clock: FakeClock) -> None:
+        async with _client(PrimaryStickiness(window=0, secret_key="secret")) as client:
+            response = await client.post("/")
+            assert READ_PRIMARY_HEADER not in response.headers
+            assert (await client.get("/")).text == "replica"
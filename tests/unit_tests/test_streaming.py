@@ -0,0 +1,55 @@
+import pytest
+from fastapi import HTTPException
+from starlette import status
+
+from app.backend.streaming import iter_lines
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _read(*chunks: bytes, max_line_length: int = 10) -> list[str]:
+    return [line async for line in iter_lines(_chunks(*chunks), max_line_length=max_line_length)]
+
+
+class TestIterLines:
+    """Test splitting a byte stream into lines with a bounded buffer"""
+
+    @pytest.mark.asyncio
+    async def test_lines_split_by_chunks(self) -> None:
+        assert await _read(b"ab", b"c\r\nd", b"e\n\nf") == ["abc", "de", "", "f"]
+
+
+    @pytest.mark.asyncio
+    async def test_line_without_newline_is_too_long(self) -> None:
+        """Test the unfinished line is rejected before the body has been read"""
+
+        read: list[bytes] = []
+
+        async def chunks():
+            for chunk in (b"first\n", b"x" * 6, b"x" * 6, b"never read"):
+                read.append(chunk)
+                yield chunk
+
+        with pytest.raises(HTTPException) as error:
+            _ = [line async for line in iter_lines(chunks(), max_line_length=10)]
+        assert error.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert error.value.detail == "Line 2 is longer than 10 bytes"
+        assert b"never read" not in read
+
+
+    @pytest.mark.asyncio
+    async def test_finished_line_is_too_long(self) -> None:
+        with pytest.raises(HTTPException) as error:
+            await _read(b"short\n" + b"x" * 11 + b"\n")
+        assert error.value.detail == "Line 2 is longer than 10 bytes"
+
+
+    @pytest.mark.asyncio
+    async def test_not_utf8(self) -> None:
+        with pytest.raises(HTTPException) as error:
+            await _read(b"ok\n", "é".encode("latin-1"))
+        assert error.value.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert error.value.detail == "Line 2 isn't valid UTF-8"
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from starlette import status
+
+from app.auth.auth_router import create_access_token, get_current_user
+from app.auth.token_cache import TokenCache, token_cache
+
+USER_ID: str = "9955edc2-6ac0-402f-9a1e-00d2e28c24cf"
+
+
+def _payload(exp: float, user_id: str = USER_ID) -> dict:
+    return {"sub": "testtest1", "id": user_id, "is_superuser": False, "exp": exp}
+
+
+class TestTokenCache:
+    """Test caching and revocation of verified JWT claims"""
+
+    def test_hit_and_miss(self) -> None:
+        cache = TokenCache(max_size=10)
+        assert cache.get("token") is None
+        payload: dict = _payload(datetime.now().timestamp() + 60)
+        cache.set("token", payload)
+        assert cache.get("token") == payload
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+    def test_expiry(self) -> None:
+        cache = TokenCache(max_size=10)
+        cache.set("token", _payload(datetime.now().timestamp() - 1))
+        assert cache.get("token") is None
+        assert cache.expirations == 1
+        assert cache.metrics()["size"] == 0
+
+
+    def test_eviction(self) -> None:
+        cache = TokenCache(max_size=2)
+        exp: float = datetime.now().timestamp() + 60
+        for token in ("token_1", "token_2"):
+            cache.set(token, _payload(exp))
+        cache.get("token_1")
+        cache.set("token_3", _payload(exp))
+        assert cache.evictions == 1
+        assert cache.get("token_2") is None
+        assert cache.get("token_1") is not None and cache.get("token_3") is not None
+
+
+    def test_revocation(self) -> None:
+        cache = TokenCache(max_size=10, revocation_ttl=60)
+        cache.set("token", _payload(datetime.now().timestamp() + 60))
+        cache.revoke_user(USER_ID)
+        assert cache.get("token") is None
+        assert cache.is_revoked(USER_ID)
+        cache.restore_user(USER_ID)
+        assert not cache.is_revoked(USER_ID)
+
+        cache = TokenCache(max_size=10, revocation_ttl=0)
+        cache.revoke_user(USER_ID)
+        assert not cache.is_revoked(USER_ID)
+
+
+    @pytest.mark.asyncio
+    async def test_revoked_user_is_rejected(self) -> None:
+        """Test a still valid token of a revoked user, also after it has been decoded again"""
+
+        token: str = await create_access_token(
+            username="testtest1", user_id=USER_ID, is_superuser=False, expires_delta=timedelta(minutes=5)
+        )
+        assert (await get_current_user(token))["id"] == USER_ID
+        token_cache.revoke_user(USER_ID)
+        for _ in range(2):
+            with pytest.raises(HTTPException) as error:
+                await get_current_user(token)
+            assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
+        token_cache.restore_user(USER_ID)
+        assert (await get_current_user(token))["id"] == USER_ID